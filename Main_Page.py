@@ -1,10 +1,10 @@
 import streamlit as st
-from data import fillters
+from data import dataset
+from perf import profiler
 from main_tabs import (
     dataset_overview,
     preprocessing,
 )
-import pandas as pd
 # Apply global style and logo
 
 
@@ -12,7 +12,9 @@ import pandas as pd
 st.set_page_config(page_title="🧪 Project Overview", layout="wide")
 
 
-df_filtered = pd.read_csv("data/Life-Expectancy-Data-Updated.csv")
+# 🔄 Pin this run to the newest finished dataset version
+dataset.refresh()
+df_filtered = dataset.load()
 
 # ---- Main Content ----
 st.title("🧪 Life Expectancy Project Overview")
@@ -83,3 +85,6 @@ with tab3:
 
 # ---- Optional main page button ----
 st.markdown("---")
+
+# Optional per-section timing panel (LE_PROFILE_PANEL=1)
+profiler.render_panel()
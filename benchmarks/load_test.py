@@ -0,0 +1,228 @@
+# load_test.py
+# Concurrent-session load test: N simulated analysts clicking through the dashboard.
+#
+#   python -m benchmarks.load_test --sessions 1 4 16 --iterations 5
+#   LE_DATA_PATH=benchmarks/data/life_expectancy_x100.csv python -m benchmarks.load_test
+#
+# Every session is an AppTest driven from its own thread inside this process, so
+# sessions share the server-side caches (cache_resource / cache_data, filter cache,
+# model store) exactly as browser sessions on one Streamlit server do. Each
+# interaction is one rerun; its wall time is the rerun latency.
+
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = {
+    "dashboard": os.path.join(ROOT, "pages", "Dashboard.py"),
+    "saudi": os.path.join(ROOT, "pages", "🟢Saudi_Arabia🟢.py"),
+}
+
+DASHBOARD_TABS = [
+    "📊 General Insights",
+    "🌍 Numerical Analysis",
+    "🗺️ Region-Based Analytics",
+    "🤖 Linear Regression Model",
+]
+
+
+def rss_mb():
+    """Current resident set size of this process (falls back to the peak off Linux)."""
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        scale = 2**20 if sys.platform == "darwin" else 2**10
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def share_runtime():
+    """Let AppTest runs overlap across threads.
+
+    AppTest installs a mock Runtime singleton for each run and clears it when the
+    run ends, which breaks any other session still running. Keep the last one
+    reachable instead, and pin the ``global.appTest`` config override that each
+    run patches in and out.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1.util import build_mock_config_get_option
+
+    last = []
+
+    def instance(cls):
+        if cls._instance is not None:
+            last[:] = [cls._instance]
+        if not last:
+            raise RuntimeError("Runtime hasn't been created!")
+        return cls._instance or last[0]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or bool(last))
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+
+
+# 🧭 Interactions: each takes (AppTest, rng) and returns something whose .run() reruns the app
+
+def pick_regions(at, rng):
+    regions = at.sidebar.multiselect[0].options
+    return at.sidebar.multiselect[0].set_value(rng.sample(regions, rng.randint(1, min(4, len(regions)))))
+
+
+def select_all_countries(at, rng):
+    box = at.sidebar.checkbox[0]
+    return box.uncheck() if box.value else box.check()
+
+
+def move_years(at, rng):
+    slider = at.sidebar.slider[0]
+    low, high = int(slider.min), int(slider.max)
+    start = rng.randint(low, high - 1)
+    return slider.set_value((start, rng.randint(start + 1, high)))
+
+
+def reset_filters(at, rng):
+    return at.sidebar.button[0].click()
+
+
+def open_tab(at, rng):
+    at.session_state["dashboard_tab"] = rng.choice(DASHBOARD_TABS)
+    return at
+
+
+def prediction_slider(at, rng):
+    at.session_state["dashboard_tab"] = DASHBOARD_TABS[3]
+    sliders = [s for s in at.slider if s.label.startswith("Select a year")]
+    if not sliders:
+        return at
+    return sliders[0].set_value(rng.randint(int(sliders[0].min), int(sliders[0].max)))
+
+
+# Weighted mix per page; "Select All" runs first so sessions start from a non-empty view
+SCENARIOS = {
+    "dashboard": [(pick_regions, 3), (select_all_countries, 1), (move_years, 3),
+                  (reset_filters, 1), (open_tab, 2), (prediction_slider, 3)],
+    "saudi": [(pick_regions, 2), (select_all_countries, 1), (move_years, 3), (reset_filters, 1)],
+}
+
+
+def run_session(page, iterations, seed, latencies, errors):
+    """Load ``page`` once, then perform ``iterations`` weighted random interactions."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed)
+    steps, weights = zip(*SCENARIOS[page])
+    at = AppTest.from_file(PAGES[page], default_timeout=600)
+
+    plan = [("load", lambda at, rng: at), ("select_all_countries", select_all_countries)]
+    plan += [(fn.__name__, fn) for fn in rng.choices(steps, weights, k=iterations)]
+    for name, step in plan:
+        try:
+            target = step(at, rng)
+            start = time.perf_counter()
+            at = target.run()
+            elapsed = time.perf_counter() - start
+        except Exception as exc:  # noqa: BLE001 - a failed session should not stop the run
+            errors.append(f"{page}/{name}: {exc!r}")
+            return
+        if at.exception:
+            errors.append(f"{page}/{name}: {at.exception[0].message}")
+            return
+        latencies.append((page, name, elapsed))
+
+
+def run_level(sessions, iterations, pages, seed):
+    """Run ``sessions`` concurrent sessions split across ``pages``; return one report row."""
+    latencies, errors = [], []
+    threads = [
+        threading.Thread(
+            target=run_session,
+            args=(pages[i % len(pages)], iterations, seed + i, latencies, errors),
+            daemon=True,
+        )
+        for i in range(sessions)
+    ]
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    seconds = np.array([s for _, _, s in latencies]) if latencies else np.zeros(1)
+    p50, p95, p99 = np.percentile(seconds, [50, 95, 99])
+    per_step = {}
+    for _, name, s in latencies:
+        per_step.setdefault(name, []).append(s)
+
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2),
+        "p50_ms": round(p50 * 1000, 1),
+        "p95_ms": round(p95 * 1000, 1),
+        "p99_ms": round(p99 * 1000, 1),
+        "rss_mb": round(rss_mb(), 1),
+        "rss_growth_mb": round(rss_mb() - rss_before, 1),
+        "p50_ms_by_step": {k: round(float(np.median(v)) * 1000, 1) for k, v in sorted(per_step.items())},
+        "errors": errors,
+    }
+
+
+def print_row(row):
+    print(f"{row['sessions']:>8}{row['reruns']:>8}{row['throughput_rps']:>10.2f}"
+          f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}"
+          f"{row['rss_mb']:>10.1f}{row['rss_growth_mb']:>+10.1f}")
+    for err in row["errors"]:
+        print(f"    ⚠️ {err}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard sessions.")
+    parser.add_argument("--sessions", nargs="+", type=int, default=[1, 4, 16],
+                        help="concurrency levels to test, one run each")
+    parser.add_argument("--iterations", type=int, default=10, help="interactions per session")
+    parser.add_argument("--pages", nargs="+", choices=sorted(PAGES), default=sorted(PAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the full report to this path")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    # Bare-mode warnings from every session thread would drown the report
+    logging.disable(logging.WARNING)
+    share_runtime()
+
+    # One untimed session fills the process-wide caches so level 1 is not a cold start
+    rss_start = rss_mb()
+    start = time.perf_counter()
+    warm_errors = []
+    for page in args.pages:
+        run_session(page, 0, args.seed, [], warm_errors)
+    print(f"🔥 warm-up {time.perf_counter() - start:.2f}s, RSS {rss_start:.0f} → {rss_mb():.0f} MB")
+    for err in warm_errors:
+        print(f"    ⚠️ {err}")
+
+    print(f"{'sessions':>8}{'reruns':>8}{'rerun/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'RSS MB':>10}{'Δ RSS':>10}")
+    report = []
+    for level in args.sessions:
+        report.append(run_level(level, args.iterations, args.pages, args.seed))
+        print_row(report[-1])
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"rss_start_mb": rss_start, "levels": report}, fh, indent=2)
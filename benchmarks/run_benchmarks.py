@@ -0,0 +1,170 @@
+# run_benchmarks.py
+# Headless timing + peak-memory report for the data pipeline and every dashboard tab.
+#
+#   python -m benchmarks.run_benchmarks                      # scales 1, 10, 100
+#   python -m benchmarks.run_benchmarks --scales 1 1000 --json bench.json
+#
+# Each scale runs in its own subprocess with LE_DATA_PATH / LE_CACHE_DIR pointing
+# at the synthetic CSV and a throwaway cache, so no state leaks between scales.
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sidebar state used for every AppTest run: all regions, all countries, all years
+_PAGE = """
+from data import dataset, fillters
+df_filtered = fillters.get_filtered_df()
+selection = fillters.current_selection()
+"""
+
+_CACHES = _PAGE + """
+dataset.cube()
+dataset.correlations()
+"""
+
+# (stage name, module, arguments passed to render) — mirrors pages/Dashboard.py
+TABS = [
+    ("general_insights", "general_insights", "df_filtered, selection"),
+    ("numrecial_analysis", "numrecial_analysis", "df_filtered, selection"),
+    ("region_based_analytics", "region_based_analytics", "df_filtered, selection"),
+    ("Linear_Model", "Linear_Model", ""),
+]
+
+# Filter views timed directly against the index
+VIEWS = {
+    "all": lambda ix: ((), (), ix.year_range),
+    "mid_east": lambda ix: (("Mid East",), (), ix.year_range),
+    "eu": lambda ix: (("EU",), (), ix.year_range),
+    "2010-2015": lambda ix: ((), (), (2010, 2015)),
+}
+
+
+def _measure(results, stage, fn):
+    """Run ``fn`` and append its wall time and traced peak allocation to ``results``."""
+    gc.collect()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    out = fn()
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - base
+    results.append({"stage": stage, "seconds": round(seconds, 4), "peak_mb": round(peak / 2**20, 2)})
+    return out
+
+
+def _apptest(script, index):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_string(script, default_timeout=600)
+    at.session_state["selected_regions"] = list(index.regions)
+    at.session_state["selected_countries"] = list(index.countries)
+    at.session_state["selected_years"] = index.year_range
+    return at
+
+
+def _run(at):
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def worker():
+    """Benchmark the dataset named by LE_DATA_PATH and print one JSON document."""
+    import pandas as pd
+    from data import engine, ingest
+    from data.correlation import CorrelationEngine
+    from data.cube import AggregateCube
+    from data.index import FilterIndex, Selection
+    from main_tabs import preprocessing
+
+    results = []
+    query = engine.create()
+    tracemalloc.start()
+
+    _measure(results, "preprocessing.process (cold)", preprocessing.process)
+    df = _measure(results, "preprocessing.process (warm)", preprocessing.process)
+    _measure(results, "pandas.read_csv (reference)", lambda: pd.read_csv(preprocessing.DATA_PATH))
+    _measure(results, "ingest.build_partitions (streaming)",
+             lambda: ingest.build_partitions(chunk_rows=50_000))
+
+    index = _measure(results, "FilterIndex build", lambda: FilterIndex(df))
+    _measure(results, f"AggregateCube build [{query.name}]", lambda: AggregateCube(df, query))
+    _measure(results, "CorrelationEngine build", lambda: CorrelationEngine(df))
+
+    for name, view in VIEWS.items():
+        regions, countries, years = view(index)
+        selection = Selection.normalize(regions or index.regions, countries or index.countries, years)
+        _measure(results, f"index.take [{name}]", lambda: index.take(selection))
+
+    at = _apptest(_PAGE, index)
+    _measure(results, "fillters.get_filtered_df (cold)", lambda: _run(at))
+    _measure(results, "fillters.get_filtered_df (warm)", lambda: _run(at))
+    _measure(results, "dataset caches (cube + correlations)", lambda: _run(_apptest(_CACHES, index)))
+
+    for stage, module, arg in TABS:
+        script = _PAGE + f"from tabs import {module}\n{module}.render({arg})\n"
+        at = _apptest(script, index)
+        _measure(results, f"{stage}.render (cold)", lambda: _run(at))
+        _measure(results, f"{stage}.render (warm)", lambda: _run(at))
+
+    tracemalloc.stop()
+    bytes_per_row = preprocessing.memory_report(df)["Bytes/row"].sum()
+    print(json.dumps({"rows": len(df), "bytes_per_row": round(bytes_per_row, 1), "stages": results}))
+
+
+def bench_scale(scale):
+    """Generate the ``scale``x dataset and benchmark it in a fresh interpreter."""
+    csv_path = synthetic.generate(scale)
+    with tempfile.TemporaryDirectory(prefix="le-bench-") as cache_dir:
+        env = dict(os.environ, LE_DATA_PATH=csv_path, LE_CACHE_DIR=cache_dir,
+                   LE_PROFILE_PANEL="", LE_PROFILE_LOG="")
+        proc = subprocess.run(
+            [sys.executable, "-m", "benchmarks.run_benchmarks", "--worker"],
+            cwd=ROOT, env=env, capture_output=True, text=True,
+        )
+    if proc.returncode:
+        raise RuntimeError(f"scale {scale} failed:\n{proc.stderr}")
+    report = json.loads(proc.stdout.strip().splitlines()[-1])
+    report["scale"] = scale
+    return report
+
+
+def print_report(report):
+    print(f"\n📏 scale x{report['scale']}  ({report['rows']:,} rows, {report['bytes_per_row']} bytes/row)")
+    print(f"{'stage':<45}{'seconds':>10}{'peak MB':>10}")
+    for row in report["stages"]:
+        print(f"{row['stage']:<45}{row['seconds']:>10.3f}{row['peak_mb']:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard on synthetic scale-up data.")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--json", help="also write the full report to this path")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker()
+        sys.exit()
+
+    os.chdir(ROOT)
+    reports = []
+    for scale in args.scales:
+        reports.append(bench_scale(scale))
+        print_report(reports[-1])
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(reports, fh, indent=2)
@@ -0,0 +1,127 @@
+# startup.py
+# Cold-start report: import time and time-to-first-paint for each page, in fresh interpreters.
+#
+#   python -m benchmarks.startup                  # every page, 3 fresh processes each
+#   python -m benchmarks.startup --repeat 5 --json startup.json
+#
+# The columnar cache and artifact store are prebuilt first (like `python -m data.versioning`
+# in a container entrypoint) and each page gets one untimed warm-up run, so the numbers
+# show what a restarted server pays in imports and rendering, not in preprocessing.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# name → (script, Dashboard tab opened on the first run or None)
+PAGES = {
+    "Main_Page": ("Main_Page.py", None),
+    "Dashboard": ("pages/Dashboard.py", None),
+    "Dashboard · Linear Regression": ("pages/Dashboard.py", "🤖 Linear Regression Model"),
+    "Saudi_Arabia": ("pages/🟢Saudi_Arabia🟢.py", None),
+}
+
+# Libraries whose import cost the pages try to defer
+HEAVY = ["plotly.express", "sklearn"]
+
+
+def worker(page):
+    """Open ``page`` once in this (fresh) interpreter and print one JSON document."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    imported = time.perf_counter()
+    script, tab = PAGES[page]
+    at = AppTest.from_file(os.path.join(ROOT, script), default_timeout=600)
+    if tab:
+        at.session_state["dashboard_tab"] = tab
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    painted = time.perf_counter()
+
+    print(json.dumps({
+        "streamlit_import_s": round(imported - start, 4),
+        "first_paint_s": round(painted - start, 4),
+        "loaded": [name for name in HEAVY if name in sys.modules],
+    }))
+
+
+def _import_seconds(stderr):
+    """Total self time of every module import from ``python -X importtime`` output."""
+    total = 0
+    for line in stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us = line.split(":", 1)[1].split("|")[0].strip()
+            if self_us.isdigit():
+                total += int(self_us)
+    return total / 1e6
+
+
+def run_page(page, env):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.startup", "--worker", page],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if proc.returncode:
+        raise RuntimeError(f"{page} failed:\n{proc.stderr[-2000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["import_s"] = round(_import_seconds(proc.stderr), 4)
+    result["process_s"] = round(wall, 4)
+    return result
+
+
+def bench(pages, repeat):
+    with tempfile.TemporaryDirectory(prefix="le-startup-") as cache_dir:
+        env = dict(os.environ, LE_CACHE_DIR=cache_dir, LE_PROFILE_PANEL="", LE_PROFILE_LOG="")
+        subprocess.run([sys.executable, "-m", "data.versioning"], cwd=ROOT, env=env,
+                       check=True, capture_output=True)
+
+        reports = []
+        for page in pages:
+            run_page(page, env)  # warm-up: fills the artifact store
+            runs = [run_page(page, env) for _ in range(repeat)]
+            reports.append({
+                "page": page,
+                "runs": runs,
+                **{key: round(statistics.median(r[key] for r in runs), 4)
+                   for key in ["import_s", "streamlit_import_s", "first_paint_s", "process_s"]},
+                "loaded": runs[-1]["loaded"],
+            })
+    return reports
+
+
+def print_report(reports):
+    print(f"{'page':<32}{'imports s':>11}{'streamlit s':>13}{'first paint s':>15}{'process s':>11}  heavy libs loaded")
+    for r in reports:
+        print(f"{r['page']:<32}{r['import_s']:>11.3f}{r['streamlit_import_s']:>13.3f}"
+              f"{r['first_paint_s']:>15.3f}{r['process_s']:>11.3f}  {', '.join(r['loaded']) or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure import time and time-to-first-paint per page.")
+    parser.add_argument("--pages", nargs="+", choices=list(PAGES), default=list(PAGES))
+    parser.add_argument("--repeat", type=int, default=3, help="fresh processes per page (median is reported)")
+    parser.add_argument("--json", help="also write the full report to this path")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker)
+        sys.exit()
+
+    os.chdir(ROOT)
+    reports = bench(args.pages, args.repeat)
+    print_report(reports)
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(reports, fh, indent=2)
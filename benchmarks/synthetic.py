@@ -0,0 +1,72 @@
+# synthetic.py
+# Scale-up panel data in the same schema as data/Life-Expectancy-Data-Updated.csv.
+#
+#   python -m benchmarks.synthetic 10 100 1000
+
+import argparse
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+import settings
+
+OUT_DIR = "benchmarks/data"
+
+# Columns copied verbatim (identifiers, calendar and 0/1 flags)
+_FIXED = ["Country", "Region", "Year", "Economy_status_Developed", "Economy_status_Developing"]
+
+# Upper bounds for percentage-style indicators
+_PERCENT = ["Hepatitis_B", "Measles", "Polio", "Diphtheria"]
+
+
+def synthesize(base, scale, seed=0):
+    """Return ``base`` grown roughly ``scale`` times, in more countries and more years.
+
+    The factor is split between a country multiplier (clones named
+    ``"<Country> #<n>"``) and a year multiplier (later blocks of years that
+    continue each country's series with a small life-expectancy drift).
+    Indicators get multiplicative noise so the copies are not identical.
+    """
+    country_factor = max(1, round(math.sqrt(scale)))
+    year_factor = max(1, math.ceil(scale / country_factor))
+    span = int(base["Year"].max() - base["Year"].min() + 1)
+    indicators = [c for c in base.columns if c not in _FIXED]
+    rng = np.random.default_rng(seed)
+
+    blocks = []
+    for year_block in range(year_factor):
+        for clone in range(country_factor):
+            block = base.copy()
+            block["Year"] = block["Year"] + year_block * span
+            if clone:
+                block["Country"] = block["Country"] + f" #{clone}"
+
+            noise = rng.normal(1.0, 0.03, size=(len(block), len(indicators)))
+            block[indicators] = (block[indicators].to_numpy(dtype="float64") * noise).round(3)
+            block["Life_expectancy"] = (block["Life_expectancy"] + 0.2 * year_block * span).clip(upper=95)
+            blocks.append(block)
+
+    out = pd.concat(blocks, ignore_index=True)
+    out[indicators] = out[indicators].clip(lower=0)
+    out[_PERCENT] = out[_PERCENT].clip(upper=100)
+    return out
+
+
+def generate(scale, source=settings.DATA_PATH, out_dir=OUT_DIR, seed=0):
+    """Write the ``scale``x dataset to ``out_dir`` (once) and return its path."""
+    path = os.path.join(out_dir, f"life_expectancy_x{scale}.csv")
+    if not os.path.exists(path):
+        os.makedirs(out_dir, exist_ok=True)
+        synthesize(pd.read_csv(source), scale, seed).to_csv(path, index=False)
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic scale-up copies of the dataset.")
+    parser.add_argument("scales", nargs="+", type=int, help="scale factors, e.g. 10 100 1000")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for scale in args.scales:
+        print(generate(scale, seed=args.seed))
@@ -0,0 +1,98 @@
+# boxes.py
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+
+
+def _quantile(sorted_values, starts, counts, q):
+    # Linear interpolation between order statistics (numpy's / Plotly's default method)
+    pos = starts + q * (counts - 1)
+    lo = np.floor(pos).astype(np.intp)
+    hi = np.minimum(lo + 1, starts + counts - 1)
+    frac = pos - lo
+    return sorted_values[lo] + frac * (sorted_values[hi] - sorted_values[lo])
+
+
+def box_stats(df, group, value, order=None):
+    """Per-group box-plot summary computed server-side in vectorized NumPy.
+
+    Returns ``(stats, outliers)``: ``stats`` has one row per non-empty group
+    with n, q1, median, q3 and the Tukey whiskers (most extreme points within
+    1.5 × IQR); ``outliers`` lists the points beyond the whiskers.
+    Groups follow ``order`` when given, else first appearance in ``df``.
+    """
+    data = df[[group, value]].dropna()
+    labels = list(order) if order is not None else list(pd.unique(data[group]))
+    codes = pd.Categorical(data[group], categories=labels).codes.astype(np.intp)
+    values = data[value].to_numpy(dtype="float64")
+    keep = codes >= 0
+    codes, values = codes[keep], values[keep]
+
+    sort = np.lexsort((values, codes))
+    codes, values = codes[sort], values[sort]
+
+    counts = np.bincount(codes, minlength=len(labels))
+    present = np.flatnonzero(counts)
+    counts = counts[present]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp)
+
+    q1 = _quantile(values, starts, counts, 0.25)
+    median = _quantile(values, starts, counts, 0.5)
+    q3 = _quantile(values, starts, counts, 0.75)
+    iqr = q3 - q1
+
+    # Map each sorted point to its position among the present groups
+    slot = np.repeat(np.arange(len(present)), counts)
+    inside = (values >= (q1 - 1.5 * iqr)[slot]) & (values <= (q3 + 1.5 * iqr)[slot])
+
+    stats = pd.DataFrame({
+        group: [labels[i] for i in present],
+        "n": counts,
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lowerfence": np.minimum.reduceat(np.where(inside, values, np.inf), starts) if len(values) else [],
+        "upperfence": np.maximum.reduceat(np.where(inside, values, -np.inf), starts) if len(values) else [],
+    })
+    outliers = pd.DataFrame({
+        group: [labels[i] for i in present[slot[~inside]]],
+        value: values[~inside],
+    })
+    return stats, outliers
+
+
+def box_figure(stats, outliers, group, value, colors=None, show_outliers=True):
+    """Plotly figure of precomputed box traces; only the summaries are serialized."""
+    palette = qualitative.Plotly
+    fig = go.Figure()
+    for i, row in enumerate(stats.to_dict("records")):
+        label = row[group]
+        color = (colors or {}).get(label, palette[i % len(palette)])
+        fig.add_trace(go.Box(
+            name=str(label),
+            x=[label],
+            q1=[row["q1"]],
+            median=[row["median"]],
+            q3=[row["q3"]],
+            lowerfence=[row["lowerfence"]],
+            upperfence=[row["upperfence"]],
+            marker_color=color,
+            legendgroup=str(label),
+        ))
+        if show_outliers:
+            points = outliers.loc[outliers[group] == label, value]
+            if len(points):
+                fig.add_trace(go.Scatter(
+                    x=[label] * len(points),
+                    y=points,
+                    mode="markers",
+                    marker=dict(color=color, size=5),
+                    name=str(label),
+                    legendgroup=str(label),
+                    showlegend=False,
+                    hovertemplate=f"{value}: %{{y}}<extra>{label}</extra>",
+                ))
+    fig.update_layout(xaxis_title=group, yaxis_title=value)
+    return fig
@@ -0,0 +1,54 @@
+# histograms.py
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+def binned_counts(df, value, group, nbins=30, labels=None):
+    """Shared bin edges plus per-group counts and means, in one NumPy pass.
+
+    Returns ``(edges, counts, means)``: ``counts`` is a frame with one column
+    per group and one row per bin, ``means`` a Series of per-group means of
+    ``value``. ``labels`` optionally maps raw group values to display names.
+    """
+    data = df[[group, value]].dropna()
+    values = data[value].to_numpy(dtype="float64")
+    codes, uniques = pd.factorize(data[group], sort=True)
+    names = [labels.get(u, u) if labels else u for u in uniques]
+
+    if len(values):
+        edges = np.histogram_bin_edges(values, bins=nbins)
+    else:
+        edges = np.linspace(0.0, 1.0, nbins + 1)
+    # Last bin is closed on the right, like np.histogram
+    bins = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, nbins - 1)
+
+    flat = np.bincount(codes * nbins + bins, minlength=len(uniques) * nbins)
+    counts = pd.DataFrame(flat.reshape(len(uniques), nbins).T, columns=names)
+
+    totals = np.bincount(codes, minlength=len(uniques))
+    sums = np.bincount(codes, weights=values, minlength=len(uniques))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = pd.Series(sums / totals, index=names)
+    return edges, counts, means
+
+
+def histogram_figure(edges, counts, colors=None, opacity=0.75):
+    """Overlaid bar traces carrying only the bin counts."""
+    centers = (edges[:-1] + edges[1:]) / 2
+    widths = np.diff(edges)
+    fig = go.Figure()
+    for name in counts.columns:
+        fig.add_trace(go.Bar(
+            x=centers,
+            y=counts[name].to_numpy(),
+            width=widths,
+            name=str(name),
+            marker_color=(colors or {}).get(name),
+            opacity=opacity,
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
+            hovertemplate="%{customdata[0]:.1f}–%{customdata[1]:.1f}: %{y}<extra>" + str(name) + "</extra>",
+        ))
+    fig.update_layout(barmode="overlay", bargap=0, yaxis_title="count")
+    return fig
@@ -0,0 +1,58 @@
+# scatter.py
+
+import numpy as np
+import pandas as pd
+
+import settings
+
+
+def render_mode(n_points):
+    """Plotly Express render_mode: WebGL above the configured row threshold."""
+    return "webgl" if n_points > settings.WEBGL_THRESHOLD else "svg"
+
+
+def decimate(df, columns, budget=None, stratify=None, grid=64, seed=0):
+    """Down-sample ``df`` to at most ``budget`` rows while keeping its shape.
+
+    Points are bucketed on a ``grid``-per-axis lattice over ``columns``
+    (separately per ``stratify`` group when given). One random point from
+    every occupied cell is kept first, so sparse regions and outliers
+    survive; the rest of the budget is a uniform random sample, which
+    preserves relative density. Sampling is seeded so reruns are stable.
+    """
+    budget = settings.SCATTER_POINT_BUDGET if budget is None else budget
+    if len(df) <= budget:
+        return df
+
+    cells = np.zeros(len(df), dtype=np.int64)
+    for col in columns:
+        values = df[col].to_numpy(dtype="float64")
+        lo, hi = np.nanmin(values), np.nanmax(values)
+        scaled = (values - lo) / (hi - lo) if hi > lo else np.zeros_like(values)
+        bucket = np.clip(np.nan_to_num(scaled, nan=0.0) * grid, 0, grid - 1).astype(np.int64)
+        cells = cells * grid + bucket
+    if stratify is not None:
+        strata = pd.factorize(df[stratify])[0].astype(np.int64)
+        cells = strata * grid ** len(columns) + cells
+
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permutation(len(df))
+    _, first = np.unique(cells[shuffled], return_index=True)
+    representatives = shuffled[first]
+
+    if len(representatives) >= budget:
+        keep = rng.choice(representatives, size=budget, replace=False)
+    else:
+        is_rep = np.zeros(len(df), dtype=bool)
+        is_rep[representatives] = True
+        rest = shuffled[~is_rep[shuffled]][:budget - len(representatives)]
+        keep = np.concatenate([representatives, rest])
+
+    return df.iloc[np.sort(keep)]
+
+
+def caption(shown, total):
+    """Caption noting when a chart shows a sample of the filtered rows."""
+    if shown < total:
+        return f"Showing a density-preserving sample of {shown:,} of {total:,} points; summary figures use all rows."
+    return None
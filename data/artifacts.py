@@ -0,0 +1,201 @@
+# artifacts.py
+# Content-addressed on-disk store for derived artifacts, so a restarted server starts warm.
+
+import functools
+import hashlib
+import os
+import pickle
+import threading
+from importlib import metadata
+
+import pandas as pd
+import streamlit as st
+
+import settings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules whose source is part of each artifact kind's code version: the code that
+# builds the artifact and the rows it is built from. A deploy only invalidates the
+# kinds whose modules it changes.
+SOURCES = {
+    "cube": ["main_tabs/preprocessing.py", "data/engine.py", "data/index.py", "data/cube.py"],
+    "profile": ["main_tabs/preprocessing.py", "data/profile.py"],
+    "correlations": ["main_tabs/preprocessing.py", "data/index.py", "data/correlation.py"],
+    "model": ["main_tabs/preprocessing.py", "data/index.py", "data/cube.py", "models/trends.py",
+              "tabs/Linear_Model.py"],
+    "figure-mortality_sunburst": ["main_tabs/preprocessing.py", "data/index.py", "tabs/general_insights.py"],
+}
+
+# Libraries whose version changes the pickled or computed artifacts
+LIBRARIES = ["numpy", "pandas", "pyarrow", "plotly", "scikit-learn"]
+
+
+@functools.lru_cache(maxsize=None)
+def code_version(kind):
+    """Hash of the sources listed for ``kind`` in SOURCES plus key library versions.
+
+    A change to one of those modules or an upgrade gives the kind new keys, so
+    stale artifacts are never read; they age out through eviction instead.
+    """
+    digest = hashlib.sha256()
+    for name in SOURCES[kind]:
+        digest.update(name.encode())
+        with open(os.path.join(ROOT, name), "rb") as f:
+            digest.update(f.read())
+    for library in LIBRARIES:
+        try:
+            digest.update(f"{library}=={metadata.version(library)}".encode())
+        except metadata.PackageNotFoundError:
+            pass
+    return digest.hexdigest()[:16]
+
+
+def _dump_pickle(value, path):
+    with open(path, "wb") as f:
+        pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_pickle(path):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def _dump_figure(fig, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(fig.to_json())
+
+
+def _load_figure(path):
+    import plotly.io as pio
+
+    with open(path, encoding="utf-8") as f:
+        return pio.from_json(f.read(), skip_invalid=True)
+
+
+# name → (file extension, dump(value, path), load(path))
+FORMATS = {
+    "parquet": (".parquet", lambda df, path: df.to_parquet(path, index=False), pd.read_parquet),
+    "pickle": (".pkl", _dump_pickle, _load_pickle),
+    "figure": (".json", _dump_figure, _load_figure),
+}
+
+
+class ArtifactStore:
+    """Files under ``root`` named by the hash of (kind, dataset version, code version, key).
+
+    Reads refresh a file's mtime; once the store grows past ``max_bytes`` the
+    least recently used files are deleted. Writes go through a temp file and
+    ``os.replace`` so concurrent processes never read a partial artifact.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._bytes = sum(size for _, size, _ in self._files())
+
+    def _files(self):
+        for dirpath, _, names in os.walk(self.root):
+            for name in names:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+    def path(self, kind, dataset, key, fmt):
+        digest = hashlib.sha256(repr((kind, dataset, code_version(kind), key)).encode()).hexdigest()
+        return os.path.join(self.root, kind, digest[:2], digest[2:] + FORMATS[fmt][0])
+
+    def get_or_build(self, kind, dataset, key, build, fmt="pickle"):
+        """Load the artifact for ``(kind, dataset, key)`` or build, store and return it.
+
+        ``kind`` must be listed in SOURCES; ``dataset`` is the source content
+        hash; ``key`` is anything with a stable ``repr`` (e.g. a Selection).
+        ``fmt`` is one of FORMATS.
+        """
+        _, dump, load = FORMATS[fmt]
+        path = self.path(kind, dataset, key, fmt)
+        try:
+            value = load(path)
+            os.utime(path)
+            with self._lock:
+                self.hits += 1
+            return value
+        except FileNotFoundError:
+            pass
+        except Exception:  # noqa: BLE001 - corrupt or incompatible file: rebuild it
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # another process already removed or replaced it
+
+        with self._lock:
+            self.misses += 1
+        value = build()
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        dump(value, tmp_path)
+        os.replace(tmp_path, path)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            size = 0  # already evicted by another process
+        with self._lock:
+            self._bytes += size
+            over = self._bytes > self.max_bytes
+        if over:
+            self.evict()
+        return value
+
+    def evict(self):
+        """Delete least recently used files until the store fits in ``max_bytes``."""
+        files = sorted(self._files(), key=lambda f: f[2])
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._bytes = total
+
+    def stats(self):
+        with self._lock:
+            return {
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "code_versions": {kind: code_version(kind) for kind in SOURCES},
+            }
+
+
+def figure(name, key, build):
+    """Plotly figure ``name`` for ``key`` on the current dataset version, built at most once.
+
+    ``figure-<name>`` must be listed in SOURCES; ``key=None`` (no filter
+    selection yet) skips the store.
+    """
+    if key is None:
+        return build()
+    from data import dataset
+
+    return shared().get_or_build(f"figure-{name}", dataset.version(), key, build, fmt="figure")
+
+
+# 🗄️ One store per server process (the files are shared by all processes on the host)
+@st.cache_resource
+def shared():
+    return ArtifactStore(settings.ARTIFACT_DIR, int(settings.ARTIFACT_CACHE_MB * 2**20))
@@ -0,0 +1,120 @@
+# correlation.py
+
+import numpy as np
+import pandas as pd
+from data.index import selection_mask
+
+# Grain at which partial sums are kept; any sidebar selection is a union of these cells
+GRAIN = ["Year", "Region", "Country"]
+
+# Columns whose correlations with every other column are kept as partial sums
+TARGETS = ["Life_expectancy"]
+
+
+def _grouped_sum(values, codes, n_groups):
+    """Sum ``values`` (rows × ...) into ``n_groups`` slots; ``codes`` must be sorted."""
+    out = np.zeros((n_groups,) + values.shape[1:])
+    if len(codes):
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        out[codes[starts]] = np.add.reduceat(values, starts, axis=0)
+    return out
+
+
+def _masked_sum(values, weights):
+    """Column sums of ``values`` over the cells weighted 1 in ``weights`` (one BLAS pass, no copy)."""
+    return weights @ values
+
+
+class CorrelationEngine:
+    """Pearson correlations with the TARGETS columns from per-country-year partial sums.
+
+    For each GRAIN cell only the sums and squares of every column and its
+    cross-products with each target are kept (a few values per column, not a
+    columns × columns matrix). A target query merges the cells matching a
+    selection, so its cost depends on the number of cells, not on the number
+    of rows. Missing values follow ``DataFrame.corr``: each pair uses the rows
+    where both columns are present. Full matrices and other targets go
+    through ``df.corr`` on the filtered rows.
+    """
+
+    def __init__(self, df: pd.DataFrame, targets=TARGETS):
+        self.columns = list(df.select_dtypes(include="number").columns)
+        self.targets = [t for t in targets if t in self.columns]
+
+        grouped = df.groupby(GRAIN, observed=True, sort=True)
+        codes = grouped.ngroup().to_numpy()
+        order = np.argsort(codes, kind="stable")
+        codes = codes[order]
+        self.keys = grouped.size().index.to_frame(index=False)
+        n_groups = len(self.keys)
+
+        x = df[self.columns].to_numpy(dtype="float64")[order]
+        present = ~np.isnan(x)
+        self._complete = bool(present.all())
+
+        # Centre on the global means so the sums-of-products form stays well conditioned
+        x = np.where(present, x - np.nanmean(x, axis=0), 0.0) if len(x) else x
+        m = present.astype("float64")
+
+        # Per target: (n, sum_j, sum_jj, sum_t, sum_tt, sum_jt) over rows where both are present
+        self.partials = {}
+        if self._complete:
+            n = np.bincount(codes, minlength=n_groups).astype("float64")
+            sx = _grouped_sum(x, codes, n_groups)
+            sx2 = _grouped_sum(x * x, codes, n_groups)
+        for target in self.targets:
+            t = self.columns.index(target)
+            xt, mt = x[:, t:t + 1], m[:, t:t + 1]
+            sxt = _grouped_sum(x * xt, codes, n_groups)
+            if self._complete:
+                self.partials[target] = (n, sx, sx2, None, None, sxt)
+            else:
+                self.partials[target] = (
+                    _grouped_sum(m * mt, codes, n_groups),
+                    _grouped_sum(x * mt, codes, n_groups),
+                    _grouped_sum(x * x * mt, codes, n_groups),
+                    _grouped_sum(xt * m, codes, n_groups),
+                    _grouped_sum(xt * xt * m, codes, n_groups),
+                    sxt,
+                )
+
+    def _merge(self, target, mask):
+        """Merged (n, sum_t, sum_j, sum_tt, sum_jj, sum_tj) of ``target`` against every column."""
+        weights = mask.astype("float64")
+        n, sx, sx2, st, st2, sxt = (None if a is None else _masked_sum(a, weights) for a in self.partials[target])
+        if self._complete:
+            t = self.columns.index(target)
+            st, st2 = sx[t], sx2[t]
+        return n, st, sx, st2, sx2, sxt
+
+    def _pearson(self, target, mask):
+        n, sx_i, sx_j, sx2_i, sx2_j, sxx = self._merge(target, mask)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxx - sx_i * sx_j / n
+            var_i = sx2_i - sx_i ** 2 / n
+            var_j = sx2_j - sx_j ** 2 / n
+            # Treat variance lost in rounding as zero so constant columns give NaN like pandas
+            var_i = np.where(var_i > 1e-12 * sx2_i, var_i, np.nan)
+            var_j = np.where(var_j > 1e-12 * sx2_j, var_j, np.nan)
+            corr = cov / np.sqrt(var_i * var_j)
+        corr = np.where(np.broadcast_to(n, corr.shape) >= 2, corr, np.nan)
+        return np.clip(corr, -1.0, 1.0)
+
+    def correlate(self, selection=None, target=None, rows=None):
+        """Pearson correlations for the rows matching ``selection``.
+
+        With ``target`` in TARGETS, only that column's correlations are
+        computed from the partial sums and returned as a Series indexed by
+        column name. Anything else (a full matrix, another target) needs the
+        filtered ``rows`` and is computed with ``DataFrame.corr``.
+        """
+        if target in self.partials:
+            values = self._pearson(target, selection_mask(self.keys, selection))
+            row = self.columns.index(target)
+            values[row] = 1.0 if not np.isnan(values[row]) else np.nan
+            return pd.Series(values, index=self.columns, name=target)
+
+        if rows is None:
+            raise ValueError(f"No partial sums for target {target!r}; pass the filtered rows")
+        matrix = rows[self.columns].astype("float64").corr()
+        return matrix if target is None else matrix[target]
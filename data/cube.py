@@ -0,0 +1,181 @@
+# cube.py
+
+import numpy as np
+import pandas as pd
+from data.engine import PandasEngine
+from data.index import category_lookup, selection_mask
+
+# Finest grain the dashboard ever groups or filters by
+DIMENSIONS = ["Year", "Region", "Country", "Developed"]
+
+
+def cells(df, engine=None):
+    """Count / sum / sum-of-squares per DIMENSIONS cell, as ``n__``/``sum__``/``sumsq__`` columns."""
+    indicators = [c for c in df.select_dtypes(include="number").columns if c not in DIMENSIONS]
+    values = df[indicators].astype("float64")
+    squares = (values ** 2).add_suffix("__sq")
+    frame = pd.concat([df[DIMENSIONS], values, squares], axis=1)
+
+    # One group-by pass on the configured engine for all three statistics
+    aggs = {}
+    for c in indicators:
+        aggs[f"n__{c}"] = (c, "count")
+        aggs[f"sum__{c}"] = (c, "sum")
+        aggs[f"sumsq__{c}"] = (f"{c}__sq", "sum")
+    return (engine or PandasEngine()).aggregate(frame, DIMENSIONS, aggs)
+
+
+def merge_cells(parts, engine=None):
+    """Combine ``cells()`` computed on disjoint row chunks into one table."""
+    table = pd.concat(parts, ignore_index=True)
+    stats = [c for c in table.columns if c not in DIMENSIONS]
+    return (engine or PandasEngine()).aggregate(table, DIMENSIONS, {c: (c, "sum") for c in stats})
+
+
+class AggregateCube:
+    """Materialized count / sum / sum-of-squares per indicator, built once at load time.
+
+    ``rollup`` answers grouped means and variances for any sidebar selection by
+    summing cube cells. Selections that keep every country of their regions
+    (the sidebar default) and don't group by Country are answered from a
+    coarse Year×Region×Developed table of a few hundred cells; the rest from
+    the full DIMENSIONS cells. Grouping runs in numpy, one pass for all
+    statistics.
+    """
+
+    def __init__(self, df: pd.DataFrame, engine=None):
+        self._load(cells(df, engine))
+
+    @classmethod
+    def from_cells(cls, table):
+        """Cube over precomputed ``cells()`` output (e.g. merged from chunks)."""
+        cube = cls.__new__(cls)
+        cube._load(table)
+        return cube
+
+    def _load(self, table):
+        self.indicators = [c[len("n__"):] for c in table.columns if c.startswith("n__")]
+        self.keys = table[DIMENSIONS]
+        self.stats = [f"{prefix}__{c}" for prefix in ("n", "sum", "sumsq") for c in self.indicators]
+        # Fine cells sorted by country, so a country selection is a set of contiguous ranges
+        self._fine = self._level(table.sort_values("Country", kind="stable"))
+        country_codes = self._fine[1]["Country"][0]
+        self._country_starts = np.searchsorted(
+            country_codes, np.arange(self._fine[1]["Country"][1] + 1), side="left"
+        )
+        coarse = [d for d in DIMENSIONS if d != "Country"]
+        self._coarse = self._level(PandasEngine().aggregate(table, coarse, {c: (c, "sum") for c in self.stats}))
+
+        # Countries per region, to tell whether a selection keeps whole regions
+        pairs = self.keys[["Region", "Country"]].drop_duplicates()
+        self._region_countries = pairs.groupby("Region", observed=True)["Country"].agg(frozenset).to_dict()
+
+    def _level(self, table):
+        """(key columns, 0-based integer codes and cardinality per key, stats matrix) for one grain."""
+        keys = table[[d for d in DIMENSIONS if d in table.columns]].reset_index(drop=True)
+        codes = {}
+        for col in keys.columns:
+            if isinstance(keys[col].dtype, pd.CategoricalDtype):
+                codes[col] = (keys[col].cat.codes.to_numpy().astype("int64"), len(keys[col].cat.categories), 0)
+            else:
+                values = keys[col].to_numpy().astype("int64")
+                low = int(values.min()) if len(values) else 0
+                high = int(values.max()) if len(values) else 0
+                codes[col] = (values - low, high - low + 1, low)
+        return keys, codes, table[self.stats].to_numpy(dtype="float64")
+
+    def _whole_regions(self, selection):
+        wanted = set(selection.countries)
+        return all(self._region_countries.get(r, frozenset()) <= wanted for r in selection.regions)
+
+    def _country_rows(self, selection):
+        """Fine-cell positions inside ``selection``, touching only the selected countries' cells."""
+        keys, codes, _ = self._fine
+        found = keys["Country"].cat.categories.get_indexer(list(selection.countries))
+        found = np.unique(found[found >= 0])
+        starts = self._country_starts[found]
+        lengths = self._country_starts[found + 1] - starts
+        # Concatenated ranges starts[i] .. starts[i] + lengths[i]
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        rows = offsets + np.arange(lengths.sum())
+
+        region_codes, _, _ = codes["Region"]
+        years, _, low = codes["Year"]
+        keep = (
+            category_lookup(keys["Region"].cat.categories, selection.regions)[region_codes[rows]]
+            & (years[rows] >= selection.years[0] - low)
+            & (years[rows] <= selection.years[1] - low)
+        )
+        return rows[keep]
+
+    def _totals(self, by, columns, selection, prefixes):
+        """Group keys and summed ``prefix__column`` stats (groups × columns) of the selected cells."""
+        coarse = "Country" not in by and (selection is None or self._whole_regions(selection))
+        keys, codes, stats = self._coarse if coarse else self._fine
+        if coarse or selection is None:
+            rows = np.flatnonzero(selection_mask(keys, selection))
+        else:
+            rows = self._country_rows(selection)
+        for b in by:
+            rows = rows[codes[b][0][rows] >= 0]  # groupby drops missing keys
+
+        # One integer key per cell, ordered like the sorted group keys
+        key = np.zeros(len(rows), dtype="int64")
+        size = 1
+        for b in by:
+            values, cardinality, _ = codes[b]
+            key = key * cardinality + values[rows]
+            size *= cardinality
+        if size <= 4 * len(key) + 1024:
+            # Small key space: find the present keys by counting instead of sorting
+            groups = np.flatnonzero(np.bincount(key, minlength=size))
+            lookup = np.empty(size, dtype="int64")
+            lookup[groups] = np.arange(len(groups))
+            inverse = lookup[key]
+        else:
+            groups, inverse = np.unique(key, return_inverse=True)
+
+        totals = {}
+        for prefix in prefixes:
+            picked = stats[rows[:, None], [self.stats.index(f"{prefix}__{c}") for c in columns]]
+            totals[prefix] = np.column_stack([
+                np.bincount(inverse, weights=picked[:, j], minlength=len(groups)) for j in range(len(columns))
+            ]).reshape(len(groups), len(columns))
+
+        # Decode in reverse; sorted like groupby (categories in category order, numbers by value)
+        out = {}
+        for b in reversed(by):
+            values, cardinality, low = codes[b]
+            groups, part = np.divmod(groups, cardinality)
+            if isinstance(keys[b].dtype, pd.CategoricalDtype):
+                out[b] = pd.Categorical.from_codes(part, dtype=keys[b].dtype)
+            else:
+                out[b] = (part + low).astype(keys[b].dtype)
+        out = {b: out[b] for b in by}
+        return out, totals
+
+    def rollup(self, by, columns, selection=None, stat="mean"):
+        """Group the cells matching ``selection`` by ``by`` and return ``stat`` per column.
+
+        ``stat`` is ``"mean"``, ``"var"`` (sample variance, ddof=1), ``"std"``,
+        ``"sum"`` or ``"count"``. Returns a flat frame like
+        ``df.groupby(by)[columns].<stat>().reset_index()``; ``selection=None``
+        means the whole dataset.
+        """
+        if stat not in ("count", "sum", "mean", "var", "std"):
+            raise ValueError(f"Unknown stat: {stat!r}")
+        prefixes = {"count": ["n"], "sum": ["sum"], "mean": ["n", "sum"]}.get(stat, ["n", "sum", "sumsq"])
+        keys, totals = self._totals(by, columns, selection, prefixes)
+
+        if stat in ("count", "sum"):
+            values = totals["n" if stat == "count" else "sum"]
+        else:
+            n, s = totals["n"], totals["sum"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.where(n > 0, s / n, np.nan)
+                if stat != "mean":
+                    var = np.where(n > 1, (totals["sumsq"] - s * values) / (n - 1), np.nan)
+                    # Rounding in sumsq - sum*mean can dip just below zero for constant groups
+                    var = np.maximum(var, 0)
+                    values = var if stat == "var" else np.sqrt(var)
+        return pd.DataFrame({**keys, **{c: values[:, j] for j, c in enumerate(columns)}})
@@ -0,0 +1,114 @@
+# dataset.py
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import settings
+from data.correlation import CorrelationEngine
+from data import artifacts, engine
+from data.cube import AggregateCube, cells as cube_cells
+from data.filter_cache import FilterCache
+from data.index import FilterIndex
+from data.profile import DataProfile
+from data.versioning import VersionedResource
+from main_tabs import preprocessing
+
+# Copy-on-Write is the default from pandas 3.0; older versions need it switched on
+# so views handed out below can never write through to the shared frame.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+class Bundle:
+    """One dataset version and everything derived from it, built together.
+
+    Swapping bundles swaps all of these at once, so a rerun never mixes a new
+    frame with an old index or cube.
+    """
+
+    def __init__(self, version):
+        self.version = version
+        # The version's digest names the columnar file, so the CSV is hashed only once
+        self.frame = preprocessing.process(version.path, digest=version.digest)
+        if version.stat_changed():
+            # Rewritten while it was read: the rows may not match the digest, so don't
+            # store anything derived from them under it (the next poll rebuilds)
+            raise RuntimeError(f"{version.path} changed while it was being loaded")
+        self.index = FilterIndex(self.frame)
+
+        # Derived tables come from the on-disk artifact store when this version was seen before
+        store = artifacts.shared()
+        self.cube = AggregateCube.from_cells(store.get_or_build(
+            "cube", version.digest, None, lambda: cube_cells(self.frame, query_engine()), fmt="parquet"
+        ))
+        self.profile = store.get_or_build("profile", version.digest, None, lambda: DataProfile(self.frame))
+        self.correlations = store.get_or_build(
+            "correlations", version.digest, None, lambda: CorrelationEngine(self.frame)
+        )
+
+
+# 📦 Newest dataset version per server process, rebuilt in the background when the CSV changes
+@st.cache_resource
+def versions():
+    return VersionedResource(preprocessing.DATA_PATH, Bundle)
+
+
+# 🧮 Configured group/aggregate engine (LE_QUERY_ENGINE)
+@st.cache_resource
+def query_engine():
+    return engine.create()
+
+
+def refresh():
+    """Serve this session's run from the newest finished dataset version.
+
+    Pages call this once at the top; everything below in the same run (and
+    fragment reruns after it) then reads one consistent bundle.
+    """
+    st.session_state["_data_bundle"] = versions().current()
+
+
+def bundle():
+    pinned = st.session_state.get("_data_bundle") if get_script_run_ctx(suppress_warning=True) else None
+    return pinned or versions().current()
+
+
+def version():
+    """Content hash of the dataset this run is served from (use it in cache keys)."""
+    return bundle().version.digest
+
+
+# 🗂️ Region/Country/Year index over the shared frame
+def index():
+    return bundle().index
+
+
+# ♻️ LRU cache of filter results shared across sessions. One per process, keyed by
+# (dataset version, selection), so FILTER_CACHE_MB bounds every version still pinned
+@st.cache_resource
+def filter_cache():
+    return FilterCache(int(settings.FILTER_CACHE_MB * 2**20))
+
+
+# 🧊 Year×Region×Country×Developed aggregate cube shared by all tabs
+def cube():
+    return bundle().cube
+
+
+# 🩺 Value ranges, unique labels and null counts for the Preprocessing tab
+def profile():
+    return bundle().profile
+
+
+# 🔗 Sufficient-statistics correlation engine
+def correlations():
+    return bundle().correlations
+
+
+def load():
+    """Return a zero-copy, read-only view of the shared dataset.
+
+    The view shares column data with the cached frame; adding or modifying
+    columns on it copies lazily instead of mutating what other sessions see.
+    """
+    return bundle().frame.copy(deep=False)
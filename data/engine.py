@@ -0,0 +1,137 @@
+# engine.py
+# Group → aggregate backends; the tabs describe a query once and any engine runs it.
+
+import pandas as pd
+import settings
+
+# Aggregations every engine supports
+STATS = ("mean", "sum", "count", "min", "max", "var", "std")
+
+
+class PandasEngine:
+    """Reference implementation: plain ``DataFrame.groupby`` on one core."""
+
+    name = "pandas"
+
+    def aggregate(self, df, by, aggs):
+        """Group ``df`` by ``by`` and compute ``aggs``.
+
+        ``aggs`` maps output column → ``(input column, stat)`` like pandas named
+        aggregation. Returns a flat frame sorted by ``by``; missing values are
+        skipped, as in pandas.
+        """
+        _check(aggs)
+        return (
+            df.groupby(by, observed=True, sort=True)
+            .agg(**{out: (col, stat) for out, (col, stat) in aggs.items()})
+            .reset_index()
+        )
+
+
+class PolarsEngine:
+    """Multi-threaded Polars backend (optional dependency)."""
+
+    name = "polars"
+
+    def __init__(self):
+        import polars as pl
+
+        self._pl = pl
+
+    def aggregate(self, df, by, aggs):
+        _check(aggs)
+        pl = self._pl
+        frame = pl.from_pandas(df[_inputs(by, aggs)])
+        exprs = []
+        for out, (col, stat) in aggs.items():
+            c = pl.col(col)
+            if stat == "count":
+                expr = c.count()
+            elif stat in ("var", "std"):
+                expr = getattr(c, stat)(ddof=1)
+            else:
+                expr = getattr(c, stat)()
+            exprs.append(expr.alias(out))
+        return _finish(frame.group_by(by).agg(exprs).to_pandas(), df, by)
+
+
+class DuckDBEngine:
+    """Embedded DuckDB backend (optional dependency); runs on all cores by default."""
+
+    name = "duckdb"
+
+    # pandas sums an all-missing group to 0; SQL returns NULL
+    _SQL = {"mean": "avg({})", "sum": "coalesce(sum({}), 0)", "count": "count({})", "min": "min({})",
+            "max": "max({})", "var": "var_samp({})", "std": "stddev_samp({})"}
+
+    def __init__(self):
+        import duckdb
+        import pyarrow as pa
+
+        self._duckdb, self._pa = duckdb, pa
+
+    def aggregate(self, df, by, aggs):
+        _check(aggs)
+        # Arrow turns NaN into NULL, which SQL aggregates skip like pandas does
+        table = self._pa.Table.from_pandas(df[_inputs(by, aggs)], preserve_index=False)
+        keys = ", ".join(f'"{b}"' for b in by)
+        select = ", ".join(
+            self._SQL[stat].format(f'"{col}"') + f' AS "{out}"' for out, (col, stat) in aggs.items()
+        )
+        with self._duckdb.connect() as con:
+            con.register("frame", table)
+            result = con.execute(f"SELECT {keys}, {select} FROM frame GROUP BY {keys}").df()
+        return _finish(result, df, by)
+
+
+ENGINES = {"pandas": PandasEngine, "polars": PolarsEngine, "duckdb": DuckDBEngine}
+
+
+def _check(aggs):
+    for col, stat in aggs.values():
+        if stat not in STATS:
+            raise ValueError(f"Unknown stat for {col!r}: {stat!r}")
+
+
+def _inputs(by, aggs):
+    return list(dict.fromkeys([*by, *(col for col, _ in aggs.values())]))
+
+
+def _finish(result, df, by):
+    """Give key columns their source dtypes and sort like the pandas engine."""
+    for b in by:
+        dtype = df[b].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Unordered categoricals compare equal regardless of category order, so rebuild
+            result[b] = pd.Categorical(result[b].to_numpy(dtype=object), dtype=dtype)
+        else:
+            result[b] = result[b].astype(dtype)
+    return result.sort_values(by, ignore_index=True)
+
+
+def create(name=None):
+    """Engine called ``name`` (default ``settings.QUERY_ENGINE``).
+
+    Falls back to pandas when the optional backend is not installed.
+    """
+    name = (name or settings.QUERY_ENGINE).lower()
+    if name not in ENGINES:
+        raise ValueError(f"Unknown query engine {name!r}; choose from {sorted(ENGINES)}")
+    try:
+        return ENGINES[name]()
+    except ImportError:
+        return PandasEngine()
+
+
+def available():
+    """Names of the engines that can be created in this environment."""
+    return [name for name in ENGINES if create(name).name == name]
+
+
+def aggregate(df, by, aggs, engine=None):
+    """Run a group → aggregate query on ``engine`` (default: the shared configured engine)."""
+    if engine is None:
+        from data import dataset
+
+        engine = dataset.query_engine()
+    return engine.aggregate(df, list(by), aggs)
@@ -2,19 +2,58 @@
 
 import streamlit as st
 import pandas as pd
-from main_tabs import preprocessing
+from data import dataset, engine
+from data.index import Selection
 
 
-@st.cache_data
 def load_data():
-    df = preprocessing.process()
-    return df
+    # Shared, read-only view; no per-rerun parse or copy
+    return dataset.load()
+
+
+def filter_frame(selection):
+    """Rows matching ``selection``, served from the shared LRU cache when possible."""
+    data = dataset.bundle()
+    return dataset.filter_cache().get_or_compute(
+        (data.version.digest, selection), lambda: data.index.take(selection)
+    )
+
+
+def current_selection():
+    """Selection behind the last get_filtered_df() call in this session (None if unset)."""
+    return st.session_state.get("filter_selection")
+
+
+def rollup(df_filtered, selection, by, columns):
+    """Mean of ``columns`` per ``by`` group over the rows of ``df_filtered``.
+
+    Rolled up from the aggregate cube when ``selection`` (the Selection behind
+    ``df_filtered``) is known. With ``selection=None`` the frame itself is
+    grouped, so the result always describes the same rows as the frame.
+    """
+    if selection is None:
+        return engine.aggregate(df_filtered, by, {col: (col, "mean") for col in columns})
+    return dataset.cube().rollup(by, columns, selection)
+
+
+def correlate(df_filtered, selection, target):
+    """Correlations of every column with ``target`` over the rows of ``df_filtered``.
+
+    Merged from the precomputed partial sums when ``selection`` is known;
+    with ``selection=None`` they are computed from the frame itself.
+    """
+    if selection is None:
+        return dataset.correlations().correlate(rows=df_filtered)[target]
+    return dataset.correlations().correlate(selection, target=target)
 
 
 def get_filtered_df():
 
-    # 📥 Load dataset
-    df = load_data()
+    # 🔄 Pin this run to the newest finished dataset version
+    dataset.refresh()
+
+    # 📥 Load the prebuilt Region/Country/Year index
+    index = dataset.index()
 
     # Sidebar navigation
     st.sidebar.title("🔗 Navigation")
@@ -23,16 +62,14 @@ def get_filtered_df():
 
     # Reset filters button
     if st.sidebar.button("🔄 Reset Filters"):
-        st.session_state["selected_regions"] = list(df["Region"].unique())
-        st.session_state["selected_countries"] = list(df["Country"].unique())
-        st.session_state["selected_years"] = (
-            int(df["Year"].min()), int(df["Year"].max())
-        )
+        st.session_state["selected_regions"] = list(index.regions)
+        st.session_state["selected_countries"] = list(index.countries)
+        st.session_state["selected_years"] = index.year_range
     
     # Prepare options
-    # 🔹 Get all unique regions and year range from the dataset
-    all_regions = df["Region"].unique()
-    all_years = (int(df["Year"].min()), int(df["Year"].max()))
+    # 🔹 Get all unique regions and year range from the index
+    all_regions = index.regions
+    all_years = index.year_range
 
     # 🔹 Get previously selected values from session state (if any)
     default_regions = st.session_state.get(
@@ -45,8 +82,7 @@ def get_filtered_df():
     )
 
     # 🔸 Filter the list of countries based on selected regions
-    filtered_country_list = df[df["Region"].isin(
-        selected_regions)]["Country"].unique()
+    filtered_country_list = index.countries_in(selected_regions)
 
     # ✅ ONLY THIS PART IS CHANGED: auto-fill selected countries based on selected regions
 
@@ -77,8 +113,7 @@ def get_filtered_df():
 
     # 🔸 Optional: Update selected_regions dynamically from selected countries
     if selected_countries:
-        selected_regions = df[df["Country"].isin(
-            selected_countries)]["Region"].unique().tolist()
+        selected_regions = index.regions_of(selected_countries)
 
     # 🔸 YEAR RANGE SELECTION
     selected_years = st.sidebar.slider(
@@ -89,12 +124,9 @@ def get_filtered_df():
         key="selected_years"
     )
 
-    # 🔸 FINAL FILTERING based on selected region, country, and year
-    filtered_df = df[
-        (df["Region"].isin(selected_regions)) &
-        (df["Country"].isin(selected_countries)) &
-        (df["Year"] >= selected_years[0]) &
-        (df["Year"] <= selected_years[1])
-    ]
+    # 🔸 FINAL FILTERING: resolve the selection through the index (or the shared cache)
+    selection = Selection.normalize(selected_regions, selected_countries, selected_years)
+    filtered_df = filter_frame(selection)
+    st.session_state["filter_selection"] = selection
 
     return filtered_df
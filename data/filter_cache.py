@@ -0,0 +1,25 @@
+# filter_cache.py
+
+from data.lru import LRUCache
+
+
+def _frame_bytes(frame):
+    return int(frame.memory_usage(deep=True).sum())
+
+
+class FilterCache(LRUCache):
+    """Bounded LRU cache of filtered frames shared by all sessions.
+
+    Keys are (dataset version, normalized ``Selection``) tuples, so the same
+    regions/countries/years picked in any order hit the same entry, and older
+    versions still pinned by open sessions share the one size limit. Entries
+    are evicted least recently used first once their combined size exceeds
+    ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes):
+        super().__init__(max_bytes, size=_frame_bytes)
+
+    def get_or_compute(self, key, compute):
+        # Hand out a view so callers adding columns never touch the cached frame
+        return super().get_or_compute(key, compute).copy(deep=False)
@@ -0,0 +1,120 @@
+# index.py
+
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+class Selection(NamedTuple):
+    """Sidebar filter selection in a canonical, order-independent form."""
+
+    regions: tuple
+    countries: tuple
+    years: tuple
+
+    @classmethod
+    def normalize(cls, regions, countries, years):
+        return cls(
+            tuple(sorted(set(regions))),
+            tuple(sorted(set(countries))),
+            (int(years[0]), int(years[1])),
+        )
+
+
+def category_lookup(categories: pd.Index, values):
+    """Boolean per category (plus a trailing False for code -1): is it one of ``values``?
+
+    Index it with categorical codes to test membership without touching strings;
+    ``get_indexer`` reuses the categories' cached hash table.
+    """
+    found = categories.get_indexer(list(values))
+    hit = np.zeros(len(categories) + 1, dtype=bool)
+    hit[found[found >= 0]] = True
+    return hit
+
+
+def _isin(column: pd.Series, values):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return category_lookup(column.cat.categories, values)[column.cat.codes.to_numpy()]
+    return column.isin(values).to_numpy()
+
+
+def selection_mask(keys: pd.DataFrame, selection):
+    """Boolean mask of the ``keys`` rows (Year/Region[/Country] columns) inside ``selection``.
+
+    ``selection=None`` selects every row. Used by the precomputed tables
+    (cube cells, correlation partials); tables already summed over Country
+    have no Country column and are filtered by region and year only.
+    """
+    if selection is None:
+        return np.ones(len(keys), dtype=bool)
+    year = keys["Year"].to_numpy()
+    mask = _isin(keys["Region"], selection.regions) & (year >= selection.years[0]) & (year <= selection.years[1])
+    if "Country" in keys.columns:
+        mask &= _isin(keys["Country"], selection.countries)
+    return mask
+
+
+class FilterIndex:
+    """Inverted index for Region/Country/Year filtering, built once at load time.
+
+    Positions refer to a stable year-sorted ordering of the rows, so a year
+    range is a contiguous block of positions and every posting list is
+    sorted. A selection resolves to positions by unioning and intersecting
+    those lists instead of scanning the string columns. Only the ordering is
+    stored; ``frame`` itself is not copied, so a memory-mapped frame stays
+    shared.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.frame = df
+        self._order = np.argsort(df["Year"].to_numpy(), kind="stable")
+        self._years = df["Year"].to_numpy()[self._order]
+
+        # Options in first-appearance order, as df[col].unique() returned them
+        self.regions = list(df["Region"].unique())
+        self.countries = list(df["Country"].unique())
+        self.year_range = (
+            (int(self._years[0]), int(self._years[-1])) if len(self._years) else (0, 0)
+        )
+
+        keys = df[["Region", "Country"]].take(self._order)
+        self.region_rows = keys.groupby("Region", sort=False, observed=True).indices
+        self.country_rows = keys.groupby("Country", sort=False, observed=True).indices
+        pairs = df[["Country", "Region"]].drop_duplicates("Country")
+        self.country_region = dict(zip(pairs["Country"], pairs["Region"]))
+
+    def countries_in(self, regions):
+        """Countries belonging to ``regions``, in dataset order."""
+        wanted = set(regions)
+        return [c for c in self.countries if self.country_region[c] in wanted]
+
+    def regions_of(self, countries):
+        """Regions that ``countries`` belong to, in dataset order."""
+        found = {self.country_region[c] for c in countries if c in self.country_region}
+        return [r for r in self.regions if r in found]
+
+    @staticmethod
+    def _union(postings, keys):
+        lists = [postings[k] for k in keys if k in postings]
+        if not lists:
+            return np.empty(0, dtype=np.intp)
+        # Posting lists are disjoint, so sorting the concatenation is a union
+        return np.sort(np.concatenate(lists))
+
+    def positions(self, selection: Selection):
+        """Sorted year-ordered positions matching ``selection``."""
+        rows = np.intersect1d(
+            self._union(self.region_rows, selection.regions),
+            self._union(self.country_rows, selection.countries),
+            assume_unique=True,
+        )
+        first = np.searchsorted(self._years, selection.years[0], side="left")
+        last = np.searchsorted(self._years, selection.years[1], side="right")
+        return rows[np.searchsorted(rows, first):np.searchsorted(rows, last)]
+
+    def take(self, selection: Selection):
+        """Rows matching ``selection``, ordered by year."""
+        positions = self.positions(selection)
+        return self.frame.take(self._order[positions]).set_axis(positions)
@@ -0,0 +1,189 @@
+# ingest.py
+# Streaming ingestion: CSV → chunked preprocessing → partitioned Parquet + aggregate cube,
+# in one pass, holding one chunk of rows (plus the running cube/profile totals) at a time.
+# An offline step for extracts too large to load whole; the app reads through
+# preprocessing.process().
+#
+#   python -m data.ingest data/Life-Expectancy-Data-Updated.csv --chunk-rows 100000
+
+import argparse
+import json
+import os
+import pickle
+import re
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import settings
+from data import cube
+from data.cube import AggregateCube
+from data.profile import DataProfile
+from main_tabs import preprocessing
+
+CUBE_FILE = "cube.parquet"
+PROFILE_FILE = "profile.pkl"
+INTEGER_FILE = "integer_columns.json"
+
+# Original CSV row number, kept so partitions can be reassembled in source order
+ROW_COLUMN = "_row"
+
+
+def _slug(value):
+    return re.sub(r"[^A-Za-z0-9]+", "_", str(value)).strip("_") or "empty"
+
+
+def _whole_numbers(chunk):
+    """Float columns of ``chunk`` holding only whole numbers (no missing values)."""
+    return {
+        col for col in chunk.select_dtypes(include="float64").columns
+        if not chunk[col].isna().any() and np.array_equal(chunk[col], np.trunc(chunk[col]))
+    }
+
+
+def _portable(chunk):
+    """Chunk-independent column types: per-chunk categoricals would disagree on categories."""
+    for col in chunk.select_dtypes(include="category").columns:
+        chunk[col] = chunk[col].astype(str)
+    return chunk
+
+
+def build_partitions(csv_path=preprocessing.DATA_PATH, cache_dir=preprocessing.CACHE_DIR,
+                     chunk_rows=None, partition_by=None, digest=None):
+    """Return the directory of ``part-<value>.parquet`` files for ``csv_path``.
+
+    Each chunk of ``chunk_rows`` rows goes through ``_preprocess_logic`` and is
+    appended to the file of its ``partition_by`` value; its cube cells and data
+    profile are folded into running totals (never a list of per-chunk parts)
+    and written as ``cube.parquet`` and ``profile.pkl``, with the measures
+    that hold only whole numbers in ``integer_columns.json``. Like
+    ``build_columnar`` the directory is named after the source hash, so it is
+    rebuilt only when the CSV (or PIPELINE_VERSION) changes.
+    """
+    chunk_rows = chunk_rows or settings.INGEST_CHUNK_ROWS
+    partition_by = partition_by or settings.INGEST_PARTITION_BY
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    source = (digest or preprocessing._source_hash(csv_path))[:16]
+    out_dir = os.path.join(cache_dir, f"{stem}-{source}-{_slug(partition_by).lower()}.parts")
+    if os.path.exists(out_dir):
+        return out_dir
+
+    tmp_dir = f"{out_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    writers, schema, totals, profile, integral, offset = {}, None, None, None, None, 0
+    try:
+        try:
+            # Declared dtypes, so every chunk (and so every partition) gets the same schema
+            chunks = pd.read_csv(csv_path, chunksize=chunk_rows, dtype=preprocessing.SOURCE_DTYPES)
+            for chunk in chunks:
+                chunk = preprocessing._preprocess_logic(chunk)
+                whole = _whole_numbers(chunk)
+                integral = whole if integral is None else integral & whole
+                part = cube.cells(chunk)
+                totals = part if totals is None else cube.merge_cells([totals, part])
+                part = DataProfile(chunk)
+                profile = part if profile is None else DataProfile.merge([profile, part])
+
+                chunk = _portable(chunk)
+                chunk[ROW_COLUMN] = range(offset, offset + len(chunk))
+                offset += len(chunk)
+
+                for value, part in chunk.groupby(partition_by, sort=False):
+                    table = pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+                    schema = schema or table.schema
+                    if value not in writers:
+                        path = os.path.join(tmp_dir, f"part-{_slug(value)}.parquet")
+                        writers[value] = pq.ParquetWriter(path, schema)
+                    writers[value].write_table(table)
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        totals.to_parquet(os.path.join(tmp_dir, CUBE_FILE), index=False)
+        with open(os.path.join(tmp_dir, PROFILE_FILE), "wb") as f:
+            pickle.dump(profile, f, protocol=pickle.HIGHEST_PROTOCOL)
+        with open(os.path.join(tmp_dir, INTEGER_FILE), "w") as f:
+            json.dump(sorted(integral), f)
+    except BaseException:
+        # A failed or interrupted run leaves no half-written directory behind
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    # Swap the finished directory in; a concurrent builder may have won the race
+    try:
+        os.replace(tmp_dir, out_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    for name in os.listdir(cache_dir):
+        old_dir = os.path.join(cache_dir, name)
+        stale = name.startswith(f"{stem}-") and not name.startswith(f"{stem}-{source}-")
+        if stale and name.endswith(".parts"):
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    return out_dir
+
+
+def partition_files(out_dir):
+    return sorted(
+        os.path.join(out_dir, name) for name in os.listdir(out_dir)
+        if name.startswith("part-") and name.endswith(".parquet")
+    )
+
+
+def load_frame(out_dir, partitions=None):
+    """Reassemble the dataset (or only the ``partitions`` values) in source row order.
+
+    The result matches ``preprocessing.process()``. Loading every partition
+    needs the whole dataset in memory; pass ``partitions`` to load a subset.
+    """
+    files = partition_files(out_dir)
+    if partitions is not None:
+        wanted = {f"part-{_slug(v)}.parquet" for v in partitions}
+        files = [f for f in files if os.path.basename(f) in wanted]
+    df = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+    df = df.sort_values(ROW_COLUMN, ignore_index=True).drop(columns=ROW_COLUMN)
+
+    # Measures were stored as float64; whole-number columns get back the integer
+    # type a read of the whole CSV infers
+    with open(os.path.join(out_dir, INTEGER_FILE)) as f:
+        integral = json.load(f)
+    df[integral] = df[integral].astype("int64")
+
+    df["Status"] = pd.Categorical(df["Status"], categories=preprocessing.STATUS_LABELS, ordered=True)
+    df["BMI_Category"] = pd.Categorical(df["BMI_Category"], categories=preprocessing.BMI_LABELS, ordered=True)
+    return preprocessing._compact_dtypes(df)
+
+
+def load_cube(out_dir):
+    """AggregateCube from the cells accumulated during ingestion (no row data needed)."""
+    cells = pd.read_parquet(os.path.join(out_dir, CUBE_FILE))
+    for col in preprocessing.CATEGORICAL_COLUMNS:
+        cells[col] = cells[col].astype("category")
+    cells["Year"] = cells["Year"].astype("int16")
+    cells["Developed"] = cells["Developed"].astype("int8")
+    return AggregateCube.from_cells(cells)
+
+
+def load_profile(out_dir):
+    """DataProfile merged from the chunk profiles written during ingestion."""
+    with open(os.path.join(out_dir, PROFILE_FILE), "rb") as f:
+        return pickle.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream a CSV into partitioned Parquet plus the aggregate cube.")
+    parser.add_argument("csv", nargs="?", default=preprocessing.DATA_PATH)
+    parser.add_argument("--out", default=preprocessing.CACHE_DIR, help="cache directory")
+    parser.add_argument("--chunk-rows", type=int, default=None)
+    parser.add_argument("--partition-by", default=None, help="e.g. Region or Year")
+    args = parser.parse_args()
+
+    out_dir = build_partitions(args.csv, args.out, args.chunk_rows, args.partition_by)
+    for path in partition_files(out_dir):
+        print(f"{pq.ParquetFile(path).metadata.num_rows:>10,}  {path}")
+    print(f"{len(pd.read_parquet(os.path.join(out_dir, CUBE_FILE))):>10,}  cube cells")
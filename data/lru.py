@@ -0,0 +1,63 @@
+# lru.py
+
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache shared by all sessions.
+
+    Each entry costs ``size(value)`` (1 by default, so ``max_size`` counts
+    entries); once the total passes ``max_size`` the least recently used
+    entries are evicted. A value costing more than ``max_size`` is returned
+    but not kept.
+    """
+
+    def __init__(self, max_size, size=None):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._size = size or (lambda value: 1)
+        self._total = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` only on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Compute outside the lock so one slow miss doesn't block other sessions
+        value = compute()
+        cost = self._size(value)
+
+        with self._lock:
+            if cost <= self.max_size and key not in self._entries:
+                self._entries[key] = (value, cost)
+                self._total += cost
+                while self._total > self.max_size:
+                    _, (_, evicted) = self._entries.popitem(last=False)
+                    self._total -= evicted
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "size": self._total,
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
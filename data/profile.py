@@ -0,0 +1,55 @@
+# profile.py
+
+import numpy as np
+import pandas as pd
+
+
+class DataProfile:
+    """Per-column data-quality summary, computed once per dataset version.
+
+    ``ranges`` holds min/max of every numeric column, ``uniques`` the sorted
+    distinct values of every label column and ``nulls`` the missing-value
+    count of every column. Profiles of disjoint row chunks merge exactly, so
+    streaming ingestion can build one without holding the whole dataset.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.rows = len(df)
+
+        numeric = df.select_dtypes(include="number")
+        self.ranges = pd.DataFrame(
+            {"Min Value": numeric.min(), "Max Value": numeric.max()}, index=numeric.columns
+        )
+
+        self.uniques = {}
+        for col in df.select_dtypes(include=["object", "string", "category"]).columns:
+            values = df[col].array
+            if isinstance(values, pd.Categorical):
+                # Present categories from the codes; no pass over the strings
+                seen = np.bincount(values.codes[values.codes >= 0], minlength=len(values.categories))
+                self.uniques[col] = sorted(values.categories[seen > 0])
+            else:
+                self.uniques[col] = sorted(pd.unique(df[col].dropna()))
+
+        self.nulls = df.isna().sum()
+
+    @classmethod
+    def merge(cls, parts):
+        """Combine profiles computed on disjoint row chunks of one dataset."""
+        profile = cls.__new__(cls)
+        profile.rows = sum(p.rows for p in parts)
+
+        ranges = pd.concat([p.ranges for p in parts])
+        profile.ranges = pd.DataFrame({
+            "Min Value": ranges["Min Value"].groupby(level=0, sort=False).min(),
+            "Max Value": ranges["Max Value"].groupby(level=0, sort=False).max(),
+        })
+
+        profile.uniques = {}
+        for part in parts:
+            for col, values in part.uniques.items():
+                profile.uniques.setdefault(col, set()).update(values)
+        profile.uniques = {col: sorted(values) for col, values in profile.uniques.items()}
+
+        profile.nulls = pd.concat([p.nulls for p in parts], axis=1).sum(axis=1).astype("int64")
+        return profile
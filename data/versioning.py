@@ -0,0 +1,141 @@
+# versioning.py
+# Watch the source CSV and rebuild what depends on it in the background.
+#
+#   python -m data.versioning          # prebuild the columnar cache and derived artifacts before starting the server
+
+import argparse
+import logging
+import os
+import threading
+import time
+from typing import NamedTuple
+
+import settings
+from main_tabs import preprocessing
+
+logger = logging.getLogger(__name__)
+
+
+def _stat(path):
+    """(mtime_ns, size) of ``path``, or None while it is missing (e.g. mid-replace)."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SourceVersion(NamedTuple):
+    path: str
+    mtime_ns: int
+    size: int
+    digest: str
+
+    @classmethod
+    def of(cls, path):
+        """Stat and hash ``path`` (hash includes PIPELINE_VERSION, like the cache file names)."""
+        stat = os.stat(path)
+        return cls(path, stat.st_mtime_ns, stat.st_size, preprocessing._source_hash(path))
+
+    def stat_changed(self):
+        """Cheap check: did mtime or size move since this version was read?"""
+        stat = _stat(self.path)
+        # Missing means mid-replace; keep serving the current version
+        return stat is not None and stat != (self.mtime_ns, self.size)
+
+
+class VersionedResource:
+    """Holds ``build(version)`` for the newest version of a source file.
+
+    ``current()`` never blocks after the first build: when the file's mtime or
+    size changes it re-hashes and rebuilds in a background thread, and keeps
+    returning the previous result until the new one is complete. The swap is a
+    single reference assignment, so readers see either the old or the new
+    result, never a mix. A file that fails to build is logged and not retried
+    until its mtime or size changes again.
+    """
+
+    def __init__(self, path, build, poll_seconds=None):
+        self.path = path
+        self._build = build
+        self._poll = settings.SOURCE_POLL_SECONDS if poll_seconds is None else poll_seconds
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._checked = 0.0
+        self._worker = None
+        self._failed = None  # (mtime_ns, size) of the last source that failed to build
+        self.generation = 0
+        self.last_error = None
+
+    def current(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    version = SourceVersion.of(self.path)
+                    self._swap(version, self._build(version))
+        self._maybe_refresh()
+        return self._value
+
+    @property
+    def version(self):
+        return self._version
+
+    def _swap(self, version, value):
+        self._version, self._value = version, value
+        self.generation += 1
+
+    def _maybe_refresh(self):
+        now = time.monotonic()
+        if now - self._checked < self._poll:
+            return
+        self._checked = now
+        if not self._version.stat_changed() or _stat(self.path) == self._failed:
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._rebuild, name="dataset-rebuild", daemon=True)
+                self._worker.start()
+
+    def _rebuild(self):
+        stat = _stat(self.path)
+        try:
+            version = SourceVersion.of(self.path)
+            if version.digest == self._version.digest:
+                # Touched but identical content: remember the new stat, keep the data
+                with self._lock:
+                    self._version = version
+                return
+            value = self._build(version)
+            with self._lock:
+                self._swap(version, value)
+            self.last_error = self._failed = None
+        except Exception as exc:  # noqa: BLE001 - a bad drop must not take the app down
+            self.last_error = exc
+            self._failed = stat
+            logger.exception(
+                "Rebuilding from %s failed; still serving version %s", self.path, self._version.digest[:16]
+            )
+
+    def wait(self, timeout=None):
+        """Block until a running background rebuild finishes (used by tools and tests)."""
+        worker = self._worker
+        if worker is not None:
+            worker.join(timeout)
+
+
+if __name__ == "__main__":
+    from data import dataset
+
+    parser = argparse.ArgumentParser(
+        description="Prebuild the columnar cache and the derived artifacts for a source CSV."
+    )
+    parser.add_argument("csv", nargs="?", default=preprocessing.DATA_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    version = SourceVersion.of(args.csv)
+    # Same build the server runs on its first request: fills the columnar cache and
+    # the artifact store (cube, profile, correlations) for the deployed code
+    dataset.Bundle(version)
+    print(f"✅ {args.csv} @ {version.digest[:16]} ready in {time.perf_counter() - start:.2f}s")
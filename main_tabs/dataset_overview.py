@@ -1,10 +1,13 @@
 import streamlit as st
 import pandas as pd
+from data import engine
+from perf import profiler
 
 def render(df_filtered: pd.DataFrame):
     st.header("📌 Dataset Overview")
 
     # 🔹 Add 4 summary columns
+    sec = profiler.start("dataset_overview.summary")
     col1, col2, col3, col4 = st.columns([1, 1, 1, 2])  # Give col4 extra space for chart
 
 
@@ -25,7 +28,7 @@ def render(df_filtered: pd.DataFrame):
         st.markdown("📌 **Progress View** (Average by Country)")
 
         # Calculate average life expectancy per country across all years
-        df_avg = df_filtered.groupby("Country", as_index=False)["Life_expectancy"].mean()
+        df_avg = engine.aggregate(df_filtered, ["Country"], {"Life_expectancy": ("Life_expectancy", "mean")})
 
         if not df_avg.empty:
             # Sort by life expectancy
@@ -47,6 +50,7 @@ def render(df_filtered: pd.DataFrame):
             )
         else:
             st.info("No data available.")
+    sec.done()
 
     st.markdown("---")
 
@@ -65,6 +69,7 @@ def render(df_filtered: pd.DataFrame):
 
     st.subheader("📂 Filtered Dataset Preview")
 
+    sec = profiler.start("dataset_overview.preview")
     preview_df = df_filtered.head().reset_index(drop=True)
     preview_df.index = preview_df.index + 1
     preview_df.index.name = "Index"
@@ -76,10 +81,13 @@ def render(df_filtered: pd.DataFrame):
     - 📊 **Columns**: `{df_filtered.shape[1]}`
     """)
     st.write(df_filtered.dtypes)
+    sec.done()
 
+    sec = profiler.start("dataset_overview.describe")
     describe_df = df_filtered.drop(columns=["Year"])
     st.subheader("📊 Descriptive Statistics")
     st.dataframe(describe_df.describe().style.format(precision=2))
+    sec.done()
 
     
     st.markdown("---")
@@ -1,94 +1,230 @@
+import hashlib
+import os
+from collections import defaultdict
+
+import numpy as np
+
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+import settings
+from perf import profiler
+
+DATA_PATH = settings.DATA_PATH
+CACHE_DIR = settings.CACHE_DIR
+
+# Bump whenever _preprocess_logic changes so stale columnar files get rebuilt
+PIPELINE_VERSION = 4
+
+RENAME_MAP = {
+    'Under_five_deaths': '0-5yrs_deaths',
+    'Alcohol_consumption': 'Alcohol',
+    'Thinness_ten_nineteen_years': 'Thinness_10-19',
+    'Thinness_five_nine_years': 'Thinness_5-9',
+    'Economy_status_Developed': 'Developed',
+    'Economy_status_Developing': 'Developing'
+}
+
+REGION_REPLACEMENTS = {
+    'Middle East': 'Mid East',
+    'European Union': 'EU',
+    'South America': 'South Am',
+    'Central America and Caribbean': 'Central Am',
+    'Rest of Europe': 'Non EU',
+    'North America': 'North Am'
+}
+
+# Derived features computed once at load time (ordered categoricals)
+STATUS_LABELS = ["Developing", "Developed"]
+BMI_BINS = [0, 18.5, 25, 30, 35, 100]
+BMI_LABELS = ["Underweight", "Normal", "Overweight", "Obese I", "Obese II+"]
+DERIVED_COLUMNS = ["Status", "BMI_Category"]
+
+# Label columns stored as categoricals
+CATEGORICAL_COLUMNS = ["Country", "Region"]
+
+# Declared types of the source CSV columns, for readers that see it a chunk at a time:
+# inferred per chunk, a measure of whole numbers would read as int64 in one chunk and
+# float64 in the next. Labels and keys are listed; every measure reads as float64.
+SOURCE_DTYPES = defaultdict(lambda: "float64", {
+    "Country": "str",
+    "Region": "str",
+    "Year": "int64",
+    "Economy_status_Developed": "int64",
+    "Economy_status_Developing": "int64",
+})
 
 
 def render(df):
+    """Describe the preprocessing steps; ``df`` is the already-processed shared dataset.
+
+    Ranges, unique values and null counts come from the profile stored with the
+    dataset version, so reruns don't rescan the rows.
+    """
+    from data import dataset
+
+    profile = dataset.profile()
     st.header("🧹 Data Cleaning & Preprocessing")
 
     # Phase 1: Rename Features
     st.subheader("🔧 Phase 1: Rename Selected Features")
-    rename_map = {
-        'Under_five_deaths': '0-5yrs_deaths',
-        'Alcohol_consumption': 'Alcohol',
-        'Thinness_ten_nineteen_years': 'Thinness_10-19',
-        'Thinness_five_nine_years': 'Thinness_5-9',
-        'Economy_status_Developed': 'Developed',
-        'Economy_status_Developing': 'Developing'
-    }
     st.write("✅ Renamed columns:")
-    st.write(pd.DataFrame(rename_map.items(), columns=["Original", "Renamed"]))
-
-    # Apply the renaming
-    df.rename(columns=rename_map, inplace=True)
+    st.write(pd.DataFrame(RENAME_MAP.items(), columns=["Original", "Renamed"]))
 
     # Phase 2: Value Ranges
     st.subheader("📊 Phase 2: Value Ranges of Numeric Features")
-    numeric_features = df.select_dtypes(include=['number'])
-    min_values = numeric_features.min()
-    max_values = numeric_features.max()
-    min_max_df = pd.DataFrame({'Min Value': min_values, 'Max Value': max_values})
-    st.dataframe(min_max_df.style.format(precision=2), use_container_width=True)
+    sec = profiler.start("preprocessing.value_ranges")
+    st.dataframe(profile.ranges.style.format(precision=2), use_container_width=True)
+    sec.done()
 
     # Phase 3: Unique Values
     st.subheader("🔣 Phase 3: Unique Values in Categorical Features")
-    categorical_features = df.select_dtypes(include=['object', 'category'])
-    for col in categorical_features.columns:
-        st.markdown(f"**📝 {col}**: {df[col].nunique()} unique value(s)")
-        st.write(sorted(df[col].dropna().unique()))
+    sec = profiler.start("preprocessing.unique_values")
+    for col, values in profile.uniques.items():
+        if col in DERIVED_COLUMNS:
+            continue
+        st.markdown(f"**📝 {col}**: {len(values)} unique value(s)")
+        st.write(values)
+    sec.done()
 
     # Phase 4: Missing Values
     st.subheader("🧪 Phase 4: Missing Values Check")
-    null_counts = df.isnull().sum()
+    sec = profiler.start("preprocessing.missing_values")
+    null_counts = profile.nulls
     total_nulls = null_counts.sum()
     if total_nulls == 0:
         st.success("✅ No missing values detected in the dataset!")
     else:
         st.warning("⚠️ Missing values detected:")
         st.dataframe(null_counts[null_counts > 0], use_container_width=True)
+    sec.done()
 
     # Phase 5: Shorten Region Names
     st.subheader("✂️ Phase 5: Shorten Region Names")
-    region_replacements = {
-        'Middle East': 'Mid East',
-        'European Union': 'EU',
-        'South America': 'South Am',
-        'Central America and Caribbean': 'Central Am',
-        'Rest of Europe': 'Non EU',
-        'North America': 'North Am'
-    }
-    df['Region'] = df['Region'].replace(region_replacements)
     st.write("✅ Replaced region names:")
-    st.write(pd.DataFrame(region_replacements.items(), columns=["Original", "Shortened"]))
+    st.write(pd.DataFrame(REGION_REPLACEMENTS.items(), columns=["Original", "Shortened"]))
+
+    # Phase 6: Derived Features
+    st.subheader("🧩 Phase 6: Derived Features")
+    st.markdown(
+        f"- **Status**: `Developed` flag as {' / '.join(STATUS_LABELS)}\n"
+        f"- **BMI_Category**: BMI binned at {BMI_BINS[1:-1]} into {', '.join(BMI_LABELS)}"
+    )
 
-# ✅ Preprocessing logic only (used by both process() and render())
+    # Phase 7: Memory Layout
+    st.subheader("🗜️ Phase 7: Compact Memory Layout")
+    sec = profiler.start("preprocessing.memory_layout")
+    report = memory_report(df)
+    st.metric("Memory per row", f"{report['Bytes/row'].sum():.1f} bytes")
+    st.dataframe(report.style.format({"Bytes/row": "{:.2f}"}), use_container_width=True)
+    sec.done()
+
+# ✅ Preprocessing logic only (applied once by build_columnar())
 def _preprocess_logic(df):
     # Rename columns
-    rename_map = {
-        'Under_five_deaths': '0-5yrs_deaths',
-        'Alcohol_consumption': 'Alcohol',
-        'Thinness_ten_nineteen_years': 'Thinness_10-19',
-        'Thinness_five_nine_years': 'Thinness_5-9',
-        'Economy_status_Developed': 'Developed',
-        'Economy_status_Developing': 'Developing'
-    }
-    df.rename(columns=rename_map, inplace=True)
+    df.rename(columns=RENAME_MAP, inplace=True)
 
     # Shorten region names
-    region_replacements = {
-        'Middle East': 'Mid East',
-        'European Union': 'EU',
-        'South America': 'South Am',
-        'Central America and Caribbean': 'Central Am',
-        'Rest of Europe': 'Non EU',
-        'North America': 'North Am'
-    }
-    df['Region'] = df['Region'].replace(region_replacements)
+    df['Region'] = df['Region'].replace(REGION_REPLACEMENTS)
+
+    # Derived features used by the tabs, so no render has to rebuild them
+    df['Status'] = pd.Categorical.from_codes(df['Developed'].to_numpy(dtype="int8"), STATUS_LABELS, ordered=True)
+    df['BMI_Category'] = pd.cut(df['BMI'], bins=BMI_BINS, labels=BMI_LABELS)
 
     return df
 
-# ✅ To use in all pages for loading + preprocessing
-@st.cache_data
-def process():
-    df = pd.read_csv("data/Life-Expectancy-Data-Updated.csv")
-    df = _preprocess_logic(df)
+# 🗜️ Memory-lean schema: categorical labels, the smallest integer types, float32 where lossless
+def _compact_dtypes(df):
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype("category")
+
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+
+    # float32 only when it still reproduces every distinct value at the source's decimal precision
+    for col in df.select_dtypes(include="float64").columns:
+        values = df[col].dropna().unique()
+        decimals = _decimals(values)
+        widened = values.astype("float32").astype("float64")
+        if decimals is not None and np.array_equal(np.round(widened, decimals), values):
+            df[col] = df[col].astype("float32")
+
     return df
+
+# Fewest decimals (up to ``limit``) that represent every value exactly, or None
+def _decimals(values, limit=6):
+    for decimals in range(limit + 1):
+        if np.array_equal(np.round(values, decimals), values):
+            return decimals
+    return None
+
+# 📏 Per-column dtype and bytes per row of the loaded frame
+def memory_report(df):
+    usage = df.memory_usage(deep=True, index=False)
+    return pd.DataFrame({
+        "Dtype": df.dtypes.astype(str),
+        "Bytes/row": usage / max(len(df), 1),
+    })
+
+# 🔑 Fingerprint of the source CSV (plus pipeline version) used to name the cache file
+def _source_hash(csv_path):
+    digest = hashlib.sha256(f"pipeline-v{PIPELINE_VERSION}".encode())
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# 🧱 Convert the CSV once into a typed, memory-mappable Arrow IPC file with preprocessing already applied
+def build_columnar(csv_path=DATA_PATH, cache_dir=CACHE_DIR, digest=None):
+    """Return the path of the preprocessed Arrow IPC file for ``csv_path``.
+
+    The file is named after the source hash, so it is rebuilt only when the
+    CSV content (or PIPELINE_VERSION) changes; pass ``digest`` when the caller
+    has already hashed it. Stale versions are removed. It is written
+    uncompressed so ``open_columnar`` can memory-map it.
+    """
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    digest = digest or _source_hash(csv_path)
+    arrow_path = os.path.join(cache_dir, f"{stem}-{digest[:16]}.arrow")
+    if os.path.exists(arrow_path):
+        return arrow_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    df = _compact_dtypes(_preprocess_logic(pd.read_csv(csv_path)))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    # Write to a temp file first so concurrent readers never see a partial file
+    tmp_path = f"{arrow_path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, arrow_path)
+
+    for name in os.listdir(cache_dir):
+        old_path = os.path.join(cache_dir, name)
+        columnar = name.endswith((".arrow", ".parquet"))
+        if name.startswith(f"{stem}-") and columnar and old_path != arrow_path:
+            # On POSIX, processes still mapping the old file keep their pages until they
+            # swap. Windows refuses to delete a mapped file; leave it for a later build.
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    return arrow_path
+
+
+def open_columnar(path):
+    """Wrap the Arrow file at ``path`` as a DataFrame without copying the columns.
+
+    Column buffers point straight into a read-only memory map, so every
+    server process on the host shares one copy of the data in the page cache.
+    """
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+# ✅ Loading + preprocessing; pages get the result through data.dataset.load()
+def process(csv_path=DATA_PATH, cache_dir=CACHE_DIR, digest=None):
+    """Preprocessed dataset for ``csv_path``; pass its ``_source_hash`` as ``digest`` if already known."""
+    return open_columnar(build_columnar(csv_path, cache_dir, digest))
@@ -0,0 +1,45 @@
+# store.py
+
+import hashlib
+
+import numpy as np
+import streamlit as st
+
+import settings
+from data import artifacts
+from data.lru import LRUCache
+
+
+def fingerprint(*arrays, config=None):
+    """Content hash of the training arrays plus the model config."""
+    digest = hashlib.sha256(repr(config).encode())
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+class ModelStore(LRUCache):
+    """Fitted models and their evaluation metrics, keyed by fingerprint.
+
+    Shared by all sessions; the least recently used entry is evicted once
+    more than ``max_entries`` models are stored. With a ``disk`` ArtifactStore,
+    misses are looked up there before fitting, so fits survive restarts.
+    """
+
+    def __init__(self, max_entries, disk=None):
+        super().__init__(max_entries)
+        self.disk = disk
+
+    def get_or_fit(self, key, fit):
+        """Return the stored result for ``key``, calling ``fit()`` only on a miss."""
+        if self.disk is None:
+            return self.get_or_compute(key, fit)
+        return self.get_or_compute(key, lambda: self.disk.get_or_build("model", None, key, fit))
+
+
+# 🗄️ One store per server process
+@st.cache_resource
+def shared():
+    return ModelStore(settings.MODEL_STORE_ENTRIES, artifacts.shared())
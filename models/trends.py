@@ -0,0 +1,63 @@
+# trends.py
+
+import numpy as np
+import pandas as pd
+
+
+def fit_trends(years, values):
+    """Least-squares line of ``values`` on ``years`` for every row at once.
+
+    ``values`` is a groups × years array with NaN for missing observations;
+    ``years`` holds the matching column labels. Uses the closed-form OLS
+    solution on per-row centred years, so all groups are solved in a few
+    array operations instead of one model fit per group.
+    """
+    values = np.asarray(values, dtype="float64")
+    x = np.broadcast_to(np.asarray(years, dtype="float64"), values.shape)
+    present = ~np.isnan(values)
+    n = present.sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean = np.where(present, x, 0.0).sum(axis=1) / n
+        y_mean = np.where(present, values, 0.0).sum(axis=1) / n
+        dx = np.where(present, x - x_mean[:, None], 0.0)
+        dy = np.where(present, values - y_mean[:, None], 0.0)
+
+        sxx = (dx * dx).sum(axis=1)
+        slope = (dx * dy).sum(axis=1) / sxx
+        # A single observed year has no slope; treat it as a flat line
+        slope = np.where(sxx > 0, slope, np.where(n > 0, 0.0, np.nan))
+        intercept = y_mean - slope * x_mean
+
+        residuals = np.where(present, values - (intercept[:, None] + slope[:, None] * x), 0.0)
+        ss_res = (residuals ** 2).sum(axis=1)
+        ss_tot = (dy * dy).sum(axis=1)
+        mse = ss_res / n
+        mae = np.abs(residuals).sum(axis=1) / n
+        r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.nan)
+
+    return {
+        "n_years": n,
+        "slope": slope,
+        "intercept": intercept,
+        "mse": mse,
+        "rmse": np.sqrt(mse),
+        "mae": mae,
+        "r2": r2,
+    }
+
+
+def group_trends(long_df, group, x="Year", y="Life_expectancy"):
+    """Fit one trend per ``group`` value from long-format ``(group, x, y)`` rows.
+
+    Returns a frame indexed by group with n_years, slope, intercept, mse,
+    rmse, mae and r2 columns.
+    """
+    panel = long_df.pivot_table(index=group, columns=x, values=y, aggfunc="mean", observed=True)
+    fit = fit_trends(panel.columns.to_numpy(), panel.to_numpy())
+    return pd.DataFrame(fit, index=panel.index)
+
+
+def forecast(trends, year):
+    """Predicted value at ``year`` for every group in a ``group_trends`` result."""
+    return trends["intercept"] + trends["slope"] * year
@@ -1,13 +1,6 @@
 import streamlit as st
 from data import fillters
-import pandas as pd
-from tabs import (
-    Linear_Model,
-    general_insights,
-    numrecial_analysis,
-    region_based_analytics,
-
-)
+from perf import profiler
 
 
 #  Page title
@@ -15,26 +8,39 @@ st.set_page_config(page_title="🌐 Life Expectancy Dashboard", layout="wide")
 st.title("🌐 Life Expectancy Dashboard")
 st.markdown("Use the sidebar to filter data by country, region, and year.")
 
-# Get filtered dataframe
+# Get filtered dataframe and the selection behind it
 df_filtered = fillters.get_filtered_df()
+selection = fillters.current_selection()
 
-# Create tabs
+# Create tabs; on_change="rerun" makes them stateful so only the open one is computed
 tab0, tab1, tab2, tab3 = st.tabs([
     "📊 General Insights",
     "🌍 Numerical Analysis",
     "🗺️ Region-Based Analytics",
     "🤖 Linear Regression Model",
-])
+], key="dashboard_tab", on_change="rerun")
 
-# Render each tab content
+# Render only the selected tab; the others run when the user opens them.
+# Each tab module (and its plotly/sklearn imports) is loaded on first open.
 with tab0:
-    general_insights.render(df_filtered)
+    if tab0.open:
+        from tabs import general_insights
+        general_insights.render(df_filtered, selection)
 
 with tab1:
-    numrecial_analysis.render(df_filtered)
+    if tab1.open:
+        from tabs import numrecial_analysis
+        numrecial_analysis.render(df_filtered, selection)
 
 with tab2:
-    region_based_analytics.render(df_filtered)
+    if tab2.open:
+        from tabs import region_based_analytics
+        region_based_analytics.render(df_filtered, selection)
 
 with tab3:
-    Linear_Model.render(pd.read_csv("data/Life-Expectancy-Data-Updated.csv"))
+    if tab3.open:
+        from tabs import Linear_Model
+        Linear_Model.render()
+
+# Optional per-section timing panel (LE_PROFILE_PANEL=1)
+profiler.render_panel()
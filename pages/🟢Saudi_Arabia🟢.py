@@ -1,13 +1,7 @@
 import streamlit as st
 from data import fillters
+from perf import profiler
 import pandas as pd
-from tabs import (
-    Linear_Model,
-    general_insights,
-    numrecial_analysis,
-    region_based_analytics,
-)
-import streamlit as st
 import plotly.express as px
 
 
@@ -21,14 +15,16 @@ st.markdown(
     "with comparison to global averages. Use the sidebar filters to adjust data."
 )
 
-# Get filtered dataframe
+# Get filtered dataframe and the selection behind it
 df_filtered = fillters.get_filtered_df()
+selection = fillters.current_selection()
 
 
 st.markdown("---")
 
 # Global average per year
-global_trend = df_filtered.groupby('Year')['Life_expectancy'].mean().reset_index()
+sec = profiler.start("saudi_arabia.vs_global")
+global_trend = fillters.rollup(df_filtered, selection, ['Year'], ['Life_expectancy'])
 global_trend['Country'] = 'Global Average'
 
 # Saudi Arabia data
@@ -38,6 +34,7 @@ saudi_trend.sort_values(by="Year", ascending=True, inplace=True)
 
 # Combine both dataframes
 compare = pd.concat([global_trend, saudi_trend], ignore_index=True)
+sec.prepared()
 
 # 1:  line chart comparing Saudi Arabia with global average
 
@@ -57,16 +54,21 @@ fig_saudi.update_layout(
 )
 st.subheader("1:  🇸🇦 Saudi Arabia vs Global Life Expectancy")
 
-st.plotly_chart(fig_saudi, use_container_width=True)
+sec.chart(fig_saudi, use_container_width=True)
 
 # 2:  Correlation with Life Expectancy for saudi arabia (Plotly Heatmap)
-corr_matrix = df_filtered[df_filtered['Country']=='Saudi Arabia'].corr(numeric_only=True)
-life_corr = corr_matrix['Life_expectancy'].drop(index=['Developing','Developed','Incidents_HIV'], errors='ignore')
+sec = profiler.start("saudi_arabia.correlation_heatmap")
+saudi_rows = df_filtered[df_filtered['Country'] == 'Saudi Arabia']
+saudi_selection = None if selection is None else selection._replace(
+    countries=tuple(c for c in selection.countries if c == 'Saudi Arabia'))
+life_corr = fillters.correlate(saudi_rows, saudi_selection, 'Life_expectancy')
+life_corr = life_corr.drop(index=['Developing','Developed','Incidents_HIV'], errors='ignore')
 life_corr = life_corr.drop(labels=["Life_expectancy"])
 
 life_corr = life_corr.reset_index()
 life_corr.columns = ["Variable", "Correlation_with_Life_expectancy"]
 life_corr = life_corr.sort_values(by="Correlation_with_Life_expectancy")
+sec.prepared()
 fig = px.imshow([life_corr["Correlation_with_Life_expectancy"]],
                 labels=dict(x='Variable',color="Correlation"),
                 x=life_corr['Variable'],
@@ -77,12 +79,14 @@ fig = px.imshow([life_corr["Correlation_with_Life_expectancy"]],
                 zmin=-1)
 fig.update_layout(height=300, title="Correlation of Each Variable with Life Expectancy: Saudi Arabia ")
 st.subheader("2:  🇸🇦 Correlation with Life Expectancy for Saudi Arabia")
-st.plotly_chart(fig, use_container_width=True)
+sec.chart(fig, use_container_width=True)
 
 
 # 2: Mortality Trends in Saudi Arabia
 
+sec = profiler.start("saudi_arabia.mortality_trends")
 df_saudi = df_filtered[df_filtered['Country']=='Saudi Arabia'].sort_values(by="Year")
+sec.prepared()
 
 fig1 = px.line(df_saudi,
               x='Year',
@@ -92,11 +96,13 @@ fig1 = px.line(df_saudi,
 fig1.update_layout(xaxis_title="Year",
                   yaxis_title="Mortality Rate (per 1,000)")
 st.subheader("3:  🇸🇦 Mortality Trends in Saudi Arabia")
-st.plotly_chart(fig1, use_container_width=True)
+sec.chart(fig1, use_container_width=True)
 
 
 # 2: Life Expectancy vs. Schooling in Saudi Arabia
+sec = profiler.start("saudi_arabia.schooling")
 df_saudi = df_filtered[df_filtered['Country']=='Saudi Arabia'].sort_values(by="Life_expectancy")
+sec.prepared()
 
 fig2 = px.line(df_saudi,
               x='Life_expectancy',
@@ -106,10 +112,12 @@ fig2 = px.line(df_saudi,
 fig2.update_layout(xaxis_title="Life Expectancy",
                   yaxis_title="Avg Schooling Years")
 st.subheader("4:  🇸🇦 Life Expectancy vs. Schooling: Saudi Arabia")
-st.plotly_chart(fig2, use_container_width=True)
+sec.chart(fig2, use_container_width=True)
 
 # 5: BMI vs Adult Mortality (Separate Charts)
+sec = profiler.start("saudi_arabia.bmi_mortality")
 df_saudi_bmi = df_filtered[df_filtered['Country'] == 'Saudi Arabia'][['Year','BMI','Adult_mortality']].sort_values(by="Year")
+sec.prepared()
 
 fig_bmi = px.line(df_saudi_bmi, x='Year', y='BMI', markers=True,
                   title='Saudi Arabia: Average BMI (2000–2015)')
@@ -120,4 +128,6 @@ fig_mort = px.line(df_saudi_bmi, x='Year', y='Adult_mortality', markers=True,
 fig_mort.update_layout(yaxis_title="Adult Mortality (per 1,000)", xaxis_title="Year")
 
 st.subheader("5:  🇸🇦 Rising BMI vs Adult Mortality in Saudi Arabia")
-st.plotly_chart(fig_bmi, use_container_width=True)
+sec.chart(fig_bmi, use_container_width=True)
+
+profiler.render_panel()
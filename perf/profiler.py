@@ -0,0 +1,105 @@
+# profiler.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+import settings
+
+_log_lock = threading.Lock()
+
+
+def enabled():
+    return settings.PROFILE_PANEL or bool(settings.PROFILE_LOG)
+
+
+def _filter_key():
+    # Imported lazily: fillters -> dataset -> preprocessing imports this module
+    from data import fillters
+
+    selection = fillters.current_selection()
+    if selection is None:
+        return None
+    return hashlib.sha1(repr(tuple(selection)).encode()).hexdigest()[:12]
+
+
+def _session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+class Section:
+    """Timing for one chart section: data prep, figure build and payload size.
+
+    Call ``prepared()`` when the data is ready, then ``chart(fig)`` (or
+    ``done()`` for sections without a figure). Only two clock reads happen
+    when profiling is disabled.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._start = time.perf_counter()
+        self._prepared = None
+
+    def prepared(self):
+        self._prepared = time.perf_counter()
+
+    def chart(self, fig, **kwargs):
+        built = time.perf_counter()
+        st.plotly_chart(fig, **kwargs)
+        if enabled():
+            self._record(built, time.perf_counter(), len(fig.to_json()))
+
+    def done(self):
+        if enabled():
+            now = time.perf_counter()
+            self._record(now, now, None)
+
+    def _record(self, built, sent, payload_bytes):
+        prepared = self._prepared or built
+        record = {
+            "ts": time.time(),
+            "session": _session_id(),
+            "filter_key": _filter_key(),
+            "section": self.name,
+            "prep_ms": round((prepared - self._start) * 1000, 3),
+            "build_ms": round((built - prepared) * 1000, 3),
+            "send_ms": round((sent - built) * 1000, 3),
+            "payload_bytes": payload_bytes,
+        }
+        st.session_state.setdefault("_profile_records", {})[self.name] = record
+        if settings.PROFILE_LOG:
+            line = json.dumps(record)
+            with _log_lock:
+                log_dir = os.path.dirname(settings.PROFILE_LOG)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                with open(settings.PROFILE_LOG, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+
+
+def start(name):
+    """Begin timing the section ``name`` (e.g. ``"general_insights.hiv_scatter"``)."""
+    return Section(name)
+
+
+def render_panel():
+    """Sidebar table of the latest measurement per section (if LE_PROFILE_PANEL is on)."""
+    if not settings.PROFILE_PANEL:
+        return
+    records = st.session_state.get("_profile_records", {})
+    with st.sidebar.expander("⏱️ Render Profile", expanded=False):
+        if not records:
+            st.caption("No sections measured yet.")
+            return
+        table = pd.DataFrame(records.values()).set_index("section")
+        st.dataframe(
+            table[["prep_ms", "build_ms", "send_ms", "payload_bytes"]],
+            use_container_width=True
+        )
@@ -0,0 +1,39 @@
+# settings.py
+# Runtime knobs for the dashboard; each can be overridden with an environment variable.
+
+import os
+
+# 📄 Source CSV and the directory holding its preprocessed columnar copies
+DATA_PATH = os.environ.get("LE_DATA_PATH", "data/Life-Expectancy-Data-Updated.csv")
+CACHE_DIR = os.environ.get("LE_CACHE_DIR", "data/cache")
+
+# 👀 Seconds between checks of the source CSV for changes (rebuilds run in the background)
+SOURCE_POLL_SECONDS = float(os.environ.get("LE_SOURCE_POLL_SECONDS", "5"))
+
+# 🧩 Streaming ingestion (python -m data.ingest): rows per chunk and the column the
+# Parquet output is partitioned by
+INGEST_CHUNK_ROWS = int(os.environ.get("LE_INGEST_CHUNK_ROWS", "100000"))
+INGEST_PARTITION_BY = os.environ.get("LE_INGEST_PARTITION_BY", "Region")
+
+# 🧮 Group/aggregate backend: pandas (reference), polars or duckdb (optional installs)
+QUERY_ENGINE = os.environ.get("LE_QUERY_ENGINE", "pandas")
+
+# 💾 On-disk store of derived artifacts (cube cells, correlations, models, figure specs)
+ARTIFACT_DIR = os.environ.get("LE_ARTIFACT_DIR", os.path.join(CACHE_DIR, "artifacts"))
+ARTIFACT_CACHE_MB = float(os.environ.get("LE_ARTIFACT_CACHE_MB", "1024"))
+
+# 🧠 Memory budget (MB) for filtered frames cached across sessions
+FILTER_CACHE_MB = float(os.environ.get("LE_FILTER_CACHE_MB", "256"))
+
+# 🤖 Fitted models kept in the shared model store before LRU eviction
+MODEL_STORE_ENTRIES = int(os.environ.get("LE_MODEL_STORE_ENTRIES", "64"))
+
+# 📍 Max points drawn per scatter chart (rows beyond this are decimated)
+SCATTER_POINT_BUDGET = int(os.environ.get("LE_SCATTER_POINT_BUDGET", "20000"))
+
+# 🖥️ Scatter charts with more rows than this switch to WebGL traces
+WEBGL_THRESHOLD = int(os.environ.get("LE_WEBGL_THRESHOLD", "5000"))
+
+# ⏱️ Per-section render profiling: sidebar panel and/or JSON-lines log path
+PROFILE_PANEL = os.environ.get("LE_PROFILE_PANEL", "").lower() in ("1", "true", "yes")
+PROFILE_LOG = os.environ.get("LE_PROFILE_LOG", "")
@@ -1,17 +1,71 @@
 # tabs/saudi_arabia.py
 
 import streamlit as st
-import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import mean_squared_error, mean_absolute_error
+from data import dataset
+from models import store, trends
+from perf import profiler
 
-def render(df_filtered: pd.DataFrame):
+# Part of the model-store key, so changing the model invalidates stored fits
+MODEL_CONFIG = {"estimator": "LinearRegression", "features": ["Year"], "target": "Life_expectancy"}
+TRENDS_CONFIG = {"estimator": "BatchedOLS", "features": ["Year"], "target": "Life_expectancy"}
+
+
+# 🧮 Train and evaluate; only called on a model-store miss, so sklearn is imported here
+def _fit_trend(X, y):
+    from sklearn.linear_model import LinearRegression
+    from sklearn.metrics import mean_squared_error, mean_absolute_error
+
+    model = LinearRegression()
+    model.fit(X, y)
+
+    # Calculate training error metrics
+    y_pred_train = model.predict(X)
+    mse = mean_squared_error(y, y_pred_train)
+    metrics = {
+        "mse": mse,
+        "rmse": np.sqrt(mse),
+        "mae": mean_absolute_error(y, y_pred_train),
+        "r2": model.score(X, y),
+    }
+    return model, metrics
+
+
+# 🌐 One trend line per country or region, all solved in a single batched call.
+# The fit covers the whole dataset, so the dataset version identifies its input and
+# slider moves only do a store lookup; the rollup runs on a miss.
+def _group_trends(level):
+    key = store.fingerprint(config={**TRENDS_CONFIG, "group": level, "dataset": dataset.version()})
+
+    def fit():
+        long_df = dataset.cube().rollup([level, "Year"], ["Life_expectancy"])
+        return trends.group_trends(long_df, level)
+
+    return store.shared().get_or_fit(key, fit)
+
+
+def render():
     st.header("Linear Regression Model: Predicting Life Expectancy")
 
-    # Aggregate data to get average life expectancy per year
-    global_trend = df_filtered.groupby("Year")["Life_expectancy"].mean().reset_index()
+    # Average life expectancy per year from the cube (the tab always models the full dataset)
+    sec = profiler.start("Linear_Model.fit")
+    global_trend = dataset.cube().rollup(["Year"], ["Life_expectancy"])
+
+    # Build regression model using available historical data, reusing a stored fit
+    # when the training data and MODEL_CONFIG are unchanged
+    X = global_trend["Year"].values.reshape(-1, 1)
+    y = global_trend["Life_expectancy"].values
+    key = store.fingerprint(X, y, config=MODEL_CONFIG)
+    model, metrics = store.shared().get_or_fit(key, lambda: _fit_trend(X, y))
+    sec.done()
+
+    _prediction_panel(global_trend, model, metrics)
+
+
+# 🎯 Runs as a fragment: moving the slider reruns only this panel, not the whole page
+@st.fragment
+def _prediction_panel(global_trend, model, metrics):
+    import plotly.graph_objects as go
 
     year_min, year_max = int(global_trend["Year"].min()), int(global_trend["Year"].max())
 
@@ -24,26 +78,14 @@ def render(df_filtered: pd.DataFrame):
         step=1
     )
 
-    # Build regression model using available historical data
-    X = global_trend["Year"].values.reshape(-1, 1)
-    y = global_trend["Life_expectancy"].values
-
-    model = LinearRegression()
-    model.fit(X, y)
-
     # Predict life expectancy for the selected year (including future years)
+    sec = profiler.start("Linear_Model.prediction_chart")
     predicted_life_exp = model.predict(np.array([[selected_year]]))[0]
 
-    # Calculate training error metrics
-    y_pred_train = model.predict(X)
-    mse = mean_squared_error(y, y_pred_train)
-    rmse = np.sqrt(mse)
-    mae = mean_absolute_error(y, y_pred_train)
-    r2 = model.score(X, y)
-
     # Prepare data for plotting regression line from earliest year to selected year
     years_extended = np.arange(year_min, selected_year + 1).reshape(-1, 1)
     life_pred_extended = model.predict(years_extended)
+    sec.prepared()
 
     # Plot actual data points, regression line, and prediction point
     fig = go.Figure()
@@ -84,7 +126,7 @@ def render(df_filtered: pd.DataFrame):
         template="plotly_white"
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
     # Show regression summary and error metrics
     st.markdown(f"""
@@ -94,8 +136,36 @@ def render(df_filtered: pd.DataFrame):
     - Predicted Life Expectancy for **{selected_year}**: **{predicted_life_exp:.2f}** years
 
     ### Model Evaluation on Training Data
-    - Mean Squared Error (MSE): **{mse:.3f}**
-    - Root Mean Squared Error (RMSE): **{rmse:.3f}**
-    - Mean Absolute Error (MAE): **{mae:.3f}**
-    - R² Score: **{r2:.3f}**
+    - Mean Squared Error (MSE): **{metrics["mse"]:.3f}**
+    - Root Mean Squared Error (RMSE): **{metrics["rmse"]:.3f}**
+    - Mean Absolute Error (MAE): **{metrics["mae"]:.3f}**
+    - R² Score: **{metrics["r2"]:.3f}**
     """)
+
+    # Per-country and per-region forecasts for the same selected year
+    st.subheader("🌐 Per-Country and Per-Region Forecasts")
+    level = st.radio("Forecast level", ["Country", "Region"], horizontal=True)
+
+    sec = profiler.start("Linear_Model.group_forecasts")
+    group_fit = _group_trends(level)
+    forecast_table = (
+        group_fit.assign(Forecast=trends.forecast(group_fit, selected_year))
+        .sort_values("Forecast", ascending=False)
+        [["Forecast", "slope", "intercept", "rmse", "mae", "r2", "n_years"]]
+    )
+
+    st.dataframe(
+        forecast_table,
+        column_config={
+            "Forecast": st.column_config.NumberColumn(f"Forecast {selected_year} (yrs)", format="%.2f"),
+            "slope": st.column_config.NumberColumn("Slope (yrs/year)", format="%.3f"),
+            "intercept": st.column_config.NumberColumn("Intercept", format="%.2f"),
+            "rmse": st.column_config.NumberColumn("RMSE", format="%.3f"),
+            "mae": st.column_config.NumberColumn("MAE", format="%.3f"),
+            "r2": st.column_config.NumberColumn("R²", format="%.3f"),
+            "n_years": st.column_config.NumberColumn("Years of Data"),
+        },
+        use_container_width=True,
+        height=400
+    )
+    sec.done()
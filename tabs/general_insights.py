@@ -1,9 +1,25 @@
 import streamlit as st
-import plotly.express as px
+from charts import histograms, scatter
+from data import artifacts, dataset, engine, fillters
+from perf import profiler
 
-def render(df_filtered):
-    """Render stacked histogram of Life Expectancy by Development Status."""    
+
+# 📊 Bin counts + group means per dataset version and filter selection, shared across sessions
+@st.cache_data(max_entries=64)
+def _status_histogram(version, selection):
+    return histograms.binned_counts(
+        fillters.filter_frame(selection), "Life_expectancy", "Status", nbins=30
+    )
+
+
+def render(df_filtered, selection):
+    """Render stacked histogram of Life Expectancy by Development Status.
+
+    ``selection`` is the Selection behind ``df_filtered``, or None when unknown.
+    """    
+    import plotly.express as px  # loaded with the tab, not at page import
     
+    sec = profiler.start("general_insights.metrics")
     avg_alcohol = df_filtered["Alcohol"].mean()
     avg_schooling = df_filtered["Schooling"].mean()
 
@@ -22,15 +38,13 @@ def render(df_filtered):
     col2.metric("🟢 Developed Countries (Last Year)", f"{int(developed_count)}")
     col3.metric("🟠 Developing Countries (Last Year)", f"{int(developing_count)}")
     col4.metric("🎓 Avg Schooling Years", f"{avg_schooling:.2f} years")
+    sec.done()
 
 
 
     # <-🔹 1: 📊 Life Expectancy Distribution by Development Status->
 
 
-    # Map labels
-    df_filtered['Developed_label'] = df_filtered['Developed'].map({0: 'Developing', 1: 'Developed'})
-
     # Custom colors (Developed = dark blue, Developing = light blue)
 
     color_map = {
@@ -39,20 +53,26 @@ def render(df_filtered):
 }
 
 
-    # Overlap the two distributions using barmode='overlay'
-    fig = px.histogram(
-        df_filtered,
-        x="Life_expectancy",
-        color="Developed_label",
-        nbins=30,
-        barmode="overlay",
-        color_discrete_map=color_map,
-        title="📊 Stacked Histogram of Life Expectancy by Developed Status"
+    # Overlap the two distributions; bins are counted server-side so only counts are sent
+    sec = profiler.start("general_insights.status_histogram")
+    if selection is not None:
+        edges, counts, status_means = _status_histogram(dataset.version(), selection)
+    else:
+        edges, counts, status_means = histograms.binned_counts(
+            df_filtered, "Life_expectancy", "Status", nbins=30
+        )
+    sec.prepared()
+
+    fig = histograms.histogram_figure(edges, counts, colors=color_map)
+    fig.update_layout(
+        title="📊 Stacked Histogram of Life Expectancy by Developed Status",
+        xaxis_title="Life_expectancy",
+        legend_title="Development Status"
     )
 
-    # Calculate means
-    mean_developed = df_filtered[df_filtered['Developed_label'] == 'Developed']['Life_expectancy'].mean()
-    mean_developing = df_filtered[df_filtered['Developed_label'] == 'Developing']['Life_expectancy'].mean()
+    # Means come from the same binning pass
+    mean_developed = status_means.get("Developed", float("nan"))
+    mean_developing = status_means.get("Developing", float("nan"))
 
     fig.add_vline(
     x=mean_developed,
@@ -72,11 +92,13 @@ def render(df_filtered):
 
     # Subheader and chart
     st.subheader("1:  📊 Life Expectancy Distribution by Development Status")
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
 
    # <-🔹 2: Life Expectancy Growth in the Middle East->
 
+    sec = profiler.start("general_insights.mid_east_growth")
+
     # Filter for Middle East region (case-insensitive, robust to preprocessing)
     me_df = df_filtered[df_filtered['Region'].str.contains("Mid East", case=False, na=False)].copy()
 
@@ -84,15 +106,16 @@ def render(df_filtered):
     me_df = me_df.sort_values(['Country', 'Year'])
 
     # Calculate annual % change in life expectancy per country
-    me_df['LE_pct_change'] = me_df.groupby('Country')['Life_expectancy'].pct_change() * 100
+    me_df['LE_pct_change'] = me_df.groupby('Country', observed=True)['Life_expectancy'].pct_change() * 100
 
     # Compute average % change per country (ignoring NaNs from pct_change)
     avg_pct_change = (
-        me_df.groupby('Country', as_index=False)['LE_pct_change']
-        .mean()
+        engine.aggregate(me_df, ['Country'], {'LE_pct_change': ('LE_pct_change', 'mean')})
         .sort_values('LE_pct_change', ascending=True)
     )
 
+    sec.prepared()
+
     # Plot: vertical bar chart of average annual % increase
     fig = px.bar(
         avg_pct_change,
@@ -114,15 +137,18 @@ def render(df_filtered):
 
     # Show header and chart
     st.subheader("📈 2: Life Expectancy Growth in the Middle East")
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
 
     # Insight 3: Average Life Expectancy Increases with Higher Levels of Schooling
 
     st.subheader("3: 📚 Average Life Expectancy by Years of Schooling")
+    sec = profiler.start("general_insights.schooling")
 
     # Calculate the average Life Expectancy for each level of Schooling (in years)
-    avg_life_exp = df_filtered.groupby('Schooling')['Life_expectancy'].mean().reset_index()
+    avg_life_exp = engine.aggregate(df_filtered, ['Schooling'], {'Life_expectancy': ('Life_expectancy', 'mean')})
+
+    sec.prepared()
 
     # Plot the average Life Expectancy against years of Schooling
     fig = px.line(
@@ -142,18 +168,24 @@ def render(df_filtered):
         margin=dict(t=40, b=40)
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
     # Insight 4: Impact of New HIV Infections on Life Expectancy
 
     st.subheader("4:    🦠 Impact of New HIV Infections on Life Expectancy")
+    sec = profiler.start("general_insights.hiv_scatter")
+
+    # Decimate per Region on a density grid and switch to WebGL for large selections
+    hiv_points = scatter.decimate(df_filtered, ["Incidents_HIV", "Life_expectancy"], stratify="Region")
+    sec.prepared()
 
     fig = px.scatter(
-        df_filtered,
+        hiv_points,
         x="Incidents_HIV",
         y="Life_expectancy",
         color="Region",
         hover_name="Country",
+        render_mode=scatter.render_mode(len(hiv_points)),
         title="Life Expectancy vs. New HIV Infections (per 1,000 uninfected, ages 15–49)",
         labels={
             "Incidents_HIV": "New HIV Infections per 1,000 (ages 15–49)",
@@ -161,21 +193,29 @@ def render(df_filtered):
         }
     )
     fig.update_layout(margin=dict(t=40, b=40))
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
+    if note := scatter.caption(len(hiv_points), len(df_filtered)):
+        st.caption(note)
 
     # Insight 5: Impact of New HIV Infections on Life Expectancy
 
+    sec = profiler.start("general_insights.mortality_sunburst")
 
-    fig = px.sunburst(
-        df_filtered,
-        path=["Region", "Country"],
-        values="Adult_mortality",
-        color="Adult_mortality",
-        color_continuous_scale="Reds",
-        hover_data=["Alcohol"],
-        title="Adult Mortality Rate Across Regions and Countries"
-    )
+    def mortality_sunburst():
+        return px.sunburst(
+            df_filtered,
+            path=["Region", "Country"],
+            values="Adult_mortality",
+            color="Adult_mortality",
+            color_continuous_scale="Reds",
+            hover_data=["Alcohol"],
+            title="Adult Mortality Rate Across Regions and Countries"
+        )
+
+    # Figure spec is stored on disk per dataset version + selection (survives restarts)
+    fig = artifacts.figure("mortality_sunburst", selection, mortality_sunburst)
+    sec.prepared()
 
     st.subheader("5: 🌞 Adult Mortality Breakdown by Region and Country")
 
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
@@ -1,11 +1,15 @@
 # tabs/numerical_analysis.py
 import streamlit as st
-import plotly.express as px
-import pandas as pd
+from charts import boxes, scatter
+from data import fillters
+from main_tabs import preprocessing
+from perf import profiler
 
 
 
-def render(df_filtered):
+def render(df_filtered, selection):
+    import plotly.express as px
+
     st.header("🌍 Numerical Analysis")
 
     if df_filtered.empty:
@@ -13,6 +17,7 @@ def render(df_filtered):
         return
 
     # ✅ Add 3 summary columns based on filtered data
+    sec = profiler.start("numrecial_analysis.metrics")
     col1, col2, col3 = st.columns(3)
 
     # Column 1: Average Life Expectancy
@@ -24,7 +29,10 @@ def render(df_filtered):
     col2.metric("🌎 Number of Countries", num_countries)
 
     # Column 3: Are we gaining or losing?
-    yearly_avg = df_filtered.groupby("Year")["Life_expectancy"].mean()
+    yearly_avg = (
+        fillters.rollup(df_filtered, selection, ["Year"], ["Life_expectancy"])
+        .set_index("Year")["Life_expectancy"]
+    )
     if len(yearly_avg) >= 2:
         trend_direction = yearly_avg.diff().dropna()
         net_change = trend_direction.sum()
@@ -34,6 +42,7 @@ def render(df_filtered):
     else:
         col3.metric("📉 Trend Direction of Life Expectancy ",
                     "Not enough data", "-")
+    sec.done()
 
     st.markdown("This section shows insights based on the current filters.")
 
@@ -41,16 +50,17 @@ def render(df_filtered):
 # 1   📊 Correlation with Life Expectancy
 
 
-# Compute correlation matrix
-    corr_matrix = df_filtered.corr(numeric_only=True)
-
-    # Get correlations with Life_expectancy only
-    life_corr = corr_matrix["Life_expectancy"].drop("Life_expectancy", errors="ignore")
+# Compute only the Life_expectancy row, merged from precomputed partial sums
+    sec = profiler.start("numrecial_analysis.correlation_heatmap")
+    life_corr = fillters.correlate(
+        df_filtered, selection, "Life_expectancy"
+    ).drop("Life_expectancy", errors="ignore")
 
     # Convert to DataFrame and sort ascending
     life_corr_df = life_corr.reset_index()
     life_corr_df.columns = ["Variable", "Correlation_with_Life_expectancy"]
     life_corr_df = life_corr_df.sort_values(by="Correlation_with_Life_expectancy", ascending=True)
+    sec.prepared()
 
     # Create heatmap
     fig = px.imshow(
@@ -69,12 +79,13 @@ def render(df_filtered):
     )
 
     st.subheader("# 1   📊 Correlation with Life Expectancy (Sorted)")
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
 
     # --------------------------------
 
     st.subheader("2:    🔍 Top Correlated Features")
+    sec = profiler.start("numrecial_analysis.top_correlations")
 
 # Sort correlations
     # top positive and negative indices start from 1
@@ -95,6 +106,7 @@ def render(df_filtered):
     with col2:
         st.markdown("**🔽 Top Negative Correlations**")
         st.table(top_negative)
+    sec.done()
 
     # --------------------------------
     
@@ -104,8 +116,16 @@ def render(df_filtered):
     Investigating the relation between thinness among youth (ages 5–9 and 10–19) and life expectancy.
     """)
     
+    # scatter_3d is already WebGL; cap the point count with per-Region grid decimation
+    sec = profiler.start("numrecial_analysis.thinness_3d")
+    thinness_points = scatter.decimate(
+        df_filtered, ["Thinness_5-9", "Thinness_10-19", "Life_expectancy"],
+        stratify="Region"
+    )
+    sec.prepared()
+
     fig = px.scatter_3d(
-        df_filtered,
+        thinness_points,
         x="Thinness_5-9",
         y="Thinness_10-19",
         z="Life_expectancy",
@@ -118,7 +138,9 @@ def render(df_filtered):
         },
         height=600
     )
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
+    if note := scatter.caption(len(thinness_points), len(df_filtered)):
+        st.caption(note)
 
     # --------------------------------
 
@@ -129,10 +151,13 @@ def render(df_filtered):
     """)
 
     # Filter necessary columns and drop missing values
+    sec = profiler.start("numrecial_analysis.alcohol_scatter")
     df_scatter = df_filtered[["Life_expectancy", "Alcohol"]].dropna()
+    alcohol_points = scatter.decimate(df_scatter, ["Life_expectancy", "Alcohol"])
+    sec.prepared()
 
     fig = px.scatter(
-        df_scatter,
+        alcohol_points,
         x="Life_expectancy",
         y="Alcohol",
         color_discrete_sequence=["#1f77b4"],  # Simple blue color
@@ -142,10 +167,13 @@ def render(df_filtered):
             "Alcohol": "Alcohol Consumption (liters per capita)"
         },
         height=500,
-        opacity=0.7
+        opacity=0.7,
+        render_mode=scatter.render_mode(len(alcohol_points))
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
+    if note := scatter.caption(len(alcohol_points), len(df_scatter)):
+        st.caption(note)
 
 # --------------------------------
 
@@ -155,23 +183,21 @@ def render(df_filtered):
     This box plot visualizes the distribution of **Life Expectancy** across different ranges of **BMI**.
     """)
 
-    # Optionally: Create BMI categories (bins)
-    df_filtered["BMI_Category"] = pd.cut(
-        df_filtered["BMI"],
-        bins=[0, 18.5, 25, 30, 35, 100],
-        labels=["Underweight", "Normal", "Overweight", "Obese I", "Obese II+"]
-    )
+    # BMI_Category is binned once at load time (see preprocessing.BMI_BINS)
+    sec = profiler.start("numrecial_analysis.bmi_box")
 
-    # Create box plot
-    fig = px.box(
-        df_filtered,
-        x="BMI_Category",
-        y="Life_expectancy",
-        color="BMI_Category",
-        category_orders={"BMI_Category": ["Underweight", "Normal", "Overweight", "Obese I", "Obese II+"]},
+    # Create box plot from server-side summaries (quartiles, whiskers, outliers)
+    box_summary, box_outliers = boxes.box_stats(
+        df_filtered, "BMI_Category", "Life_expectancy", order=preprocessing.BMI_LABELS
+    )
+    sec.prepared()
+    fig = boxes.box_figure(box_summary, box_outliers, "BMI_Category", "Life_expectancy")
+    fig.update_layout(
         title="Life Expectancy Distribution by BMI Category",
-        labels={"Life_expectancy": "Life Expectancy (years)", "BMI_Category": "BMI Category"},
+        xaxis_title="BMI Category",
+        yaxis_title="Life Expectancy (years)",
+        legend_title="BMI Category",
         height=500
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
@@ -1,14 +1,23 @@
 # tabs/project_info.py
 import streamlit as st
-import plotly.express as px
 import pandas as pd
+from charts import boxes
+from data import fillters
+from main_tabs import preprocessing
+from perf import profiler
+
+def render(df_filtered, selection):
+    import plotly.express as px
 
-def render(df_filtered):
     
     st.header("🗺️ Region-Based Analytics")
 
+    # Grouped means below are rolled up from the shared aggregate cube for ``selection``
+    # (the Selection behind df_filtered; None groups df_filtered itself)
+
     
     # Show metrics for the last year using df_filtered
+    sec = profiler.start("region_based_analytics.metrics")
     latest_year = df_filtered["Year"].max()
     latest_df = df_filtered[df_filtered["Year"] == latest_year]
 
@@ -18,37 +27,38 @@ def render(df_filtered):
     col1, col2 = st.columns(2)
     col1.metric("🌍 Total Population (mln, last year)", f"{total_population:,.2f}")
     col2.metric("💰 Average GDP per Capita (USD, last year)", f"{avg_gdp_per_capita:,.2f}")
+    sec.done()
     
     st.markdown("---")
     
     st.subheader("1:    📦 Life Expectancy Distribution by Region")
 
-    # 1: Boxplot
-    fig = px.box(
-        df_filtered,
-        x='Region',
-        y='Life_expectancy',
-        color='Region',
-        title="Life Expectancy Distribution by Region",
-        labels={'Life_expectancy': 'Life Expectancy (Years)'},
-        points='outliers',  # Show only outliers (also can use 'all' or 'suspectedoutliers')
-        template='plotly_white'
-    )
+    # 1: Boxplot from server-side quartiles/whiskers; only outliers are sent as points
+    sec = profiler.start("region_based_analytics.region_box")
+    box_summary, box_outliers = boxes.box_stats(df_filtered, 'Region', 'Life_expectancy')
+    sec.prepared()
+    fig = boxes.box_figure(box_summary, box_outliers, 'Region', 'Life_expectancy')
 
     fig.update_layout(
+        title="Life Expectancy Distribution by Region",
+        template='plotly_white',
         xaxis_title="Region",
         yaxis_title="Life Expectancy",
         showlegend=False,
         margin=dict(t=50, b=50)
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
    
 
     # 2:
 
+    sec = profiler.start("region_based_analytics.bmi_trend")
+    bmi_trend = fillters.rollup(df_filtered, selection, ['Year', 'Region'], ['BMI']).assign(Year=lambda d: d['Year'].astype(str))
+    sec.prepared()
+
     fig = px.line(
-    df_filtered.groupby(['Year', 'Region'])['BMI'].mean().reset_index().assign(Year=lambda d: d['Year'].astype(str)),
+    bmi_trend,
     x='Year',
     y='BMI',
     color='Region',
@@ -62,20 +72,18 @@ def render(df_filtered):
     )
     
     st.subheader("2:    🧬 Regional Trends in Average BMI Over Time")
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
     #  3:
 
     st.subheader("3:    🧬 Heatmap of Average 0-5 Years Deaths by Region and Status")
 
-    heatmap_data = df_filtered.copy()
-
-    heatmap_data['Status'] = heatmap_data.apply(
-    lambda row: "Developed" if row['Developed'] == 1 else "Developing", axis=1
-)    
-
     # Prepare the data
-    heatmap_data = heatmap_data.groupby(['Region', 'Status'])['0-5yrs_deaths'].mean().reset_index()
+    sec = profiler.start("region_based_analytics.deaths_heatmap")
+    heatmap_data = fillters.rollup(df_filtered, selection, ['Region', 'Developed'], ['0-5yrs_deaths'])
+    heatmap_data['Status'] = heatmap_data['Developed'].map(dict(enumerate(preprocessing.STATUS_LABELS)))
+    heatmap_data = heatmap_data[['Region', 'Status', '0-5yrs_deaths']].sort_values(['Region', 'Status'])
+    sec.prepared()
 
     # Create density heatmap
     fig = px.density_heatmap(
@@ -88,7 +96,7 @@ def render(df_filtered):
         nbinsx=len(heatmap_data['Region'].unique())
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
   
     
@@ -98,15 +106,14 @@ def render(df_filtered):
 
     st.subheader("4: 🌐 Life Expectancy Differences by Region and Economic Status")
 
-    # Map 'Developed' column to readable status if not already present
-    df_le = df_filtered.copy()
-    df_le['Economy_status'] = df_le['Developed'].map({0: 'Developing', 1: 'Developed'})
-
     # Calculate mean life expectancy grouped by Region and Economy status
+    sec = profiler.start("region_based_analytics.status_bars")
+    mean_life_by_region_status = fillters.rollup(df_filtered, selection, ['Region', 'Developed'], ['Life_expectancy'])
+    mean_life_by_region_status['Economy_status'] = mean_life_by_region_status['Developed'].map(dict(enumerate(preprocessing.STATUS_LABELS)))
     mean_life_by_region_status = (
-        df_le.groupby(['Region', 'Economy_status'])['Life_expectancy']
-        .mean()
-        .reset_index()
+        mean_life_by_region_status[['Region', 'Economy_status', 'Life_expectancy']]
+        .sort_values(['Region', 'Economy_status'])
+        .reset_index(drop=True)
     )
 
     # Sort regions by mean life expectancy of Developing countries (for consistent order)
@@ -115,6 +122,7 @@ def render(df_filtered):
         .sort_values('Life_expectancy', ascending=False)['Region']
         .tolist()
     )
+    sec.prepared()
 
     # Plot grouped bar chart
     fig = px.bar(
@@ -139,18 +147,18 @@ def render(df_filtered):
         xaxis_tickangle=45
     )
 
-    st.plotly_chart(fig, use_container_width=True)  
+    sec.chart(fig, use_container_width=True)  
 
 
     # 5: Relationship Between Immunization Rates and Infant Deaths
 
 
     # Filter and average by region
-    bubble_df = (
-        df_filtered.groupby("Region")[["Polio", "Diphtheria", "Hepatitis_B", "Infant_deaths"]]
-        .mean()
-        .reset_index()
+    sec = profiler.start("region_based_analytics.immunization_bubbles")
+    bubble_df = fillters.rollup(
+        df_filtered, selection, ["Region"], ["Polio", "Diphtheria", "Hepatitis_B", "Infant_deaths"]
     )
+    sec.prepared()
 
     fig = px.scatter(
         bubble_df,
@@ -178,6 +186,6 @@ def render(df_filtered):
     )
     
     st.subheader("5: 🧬 Immunization Coverage and Its Impact on Infant Deaths")
-    st.plotly_chart(fig, use_container_width=True)
+    sec.chart(fig, use_container_width=True)
 
 